@@ -0,0 +1,249 @@
+"""
+Sprite atlas packing for batch outputs.
+"""
+import json
+from pathlib import Path
+
+from PIL import Image
+import numpy as np
+
+from .processor import ImageProcessor
+
+class AtlasPacker:
+    """
+    Pack many small images into a few large atlas textures.
+
+    Sprites are placed with a shelf packer: they are sorted by height and laid
+    out left to right in rows, opening a new row when the current one is full
+    and a new page when the page is full. All pages share one indexed palette.
+    """
+
+    # Upper bound on the number of weighted samples used to build the shared palette
+    PALETTE_SAMPLE_LIMIT = 1 << 20
+
+    def __init__(self, max_size=2048, padding=1):
+        """
+        Initialize the packer.
+
+        Args:
+            max_size (int): Maximum width and height of an atlas page (default: 2048)
+            padding (int): Empty pixels left between sprites (default: 1)
+
+        Raises:
+            ValueError: If max_size or padding is invalid
+        """
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("Atlas size must be a positive integer")
+
+        if not isinstance(padding, int) or padding < 0:
+            raise ValueError("Padding must be a non-negative integer")
+
+        self.max_size = max_size
+        self.padding = padding
+
+    def check_fits(self, width, height):
+        """
+        Check that a sprite fits on a single page.
+
+        Args:
+            width (int): Sprite width in pixels
+            height (int): Sprite height in pixels
+
+        Raises:
+            ValueError: If the sprite is wider or taller than a page
+        """
+        if width > self.max_size or height > self.max_size:
+            raise ValueError(f"Sprite of size {width}x{height} does not fit in a {self.max_size}px atlas")
+
+    def pack(self, sizes):
+        """
+        Compute sprite positions.
+
+        Args:
+            sizes (list): List of (width, height) tuples
+
+        Returns:
+            tuple: (placements, page_sizes) where placements is a list of
+                (page, x, y) tuples in the order of sizes and page_sizes is a
+                list of (width, height) tuples, one per page
+
+        Raises:
+            ValueError: If a sprite does not fit on a single page
+        """
+        placements = [None] * len(sizes)
+        page_sizes = []
+
+        # Tallest first keeps shelves tight
+        order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+
+        page = -1
+        x = y = shelf_height = used_width = 0
+        for i in order:
+            w, h = sizes[i]
+            self.check_fits(w, h)
+
+            if page >= 0 and x + w > self.max_size:
+                # Start a new shelf
+                x = 0
+                y += shelf_height + self.padding
+                shelf_height = 0
+
+            if page < 0 or y + h > self.max_size:
+                # Start a new page
+                if page >= 0:
+                    page_sizes.append((used_width, y + shelf_height))
+                page += 1
+                x = y = shelf_height = used_width = 0
+
+            placements[i] = (page, x, y)
+            x += w + self.padding
+            shelf_height = max(shelf_height, h)
+            used_width = max(used_width, x - self.padding)
+
+        if page >= 0:
+            page_sizes.append((used_width, y + shelf_height))
+
+        return placements, page_sizes
+
+    def build(self, images, color_count=256, palette_name=None, scale=1):
+        """
+        Pack images into indexed atlas pages.
+
+        Args:
+            images (dict): Mapping of sprite name to PIL.Image; names mapped to
+                the same image object share one rectangle
+            color_count (int): Number of colors in an adaptive shared palette (default: 256)
+            palette_name (str): Name of predefined palette to use, always used
+                whole like ImageProcessor.reduce_colors does (default: None for adaptive)
+            scale (int): Upscale factor applied to each sprite as it is pasted,
+                so callers can keep only small block grids (default: 1)
+
+        Returns:
+            tuple: (pages, index) where pages is a list of 'P' mode PIL.Image
+                objects and index maps each sprite name to its page and rectangle
+
+        Raises:
+            ValueError: If input parameters are invalid
+        """
+        if not isinstance(color_count, int) or color_count <= 0 or color_count > 256:
+            raise ValueError("Color count must be an integer between 1 and 256")
+
+        if not isinstance(scale, int) or scale <= 0:
+            raise ValueError("Scale must be a positive integer")
+
+        # Names that refer to the same image object share one rectangle
+        slots = {}
+        for name, image in images.items():
+            slots.setdefault(id(image), (image, []))[1].append(name)
+
+        # Transparent sprites keep their transparency through one reserved palette index
+        has_alpha = any(ImageProcessor.has_alpha(image) for image, _ in slots.values())
+        mode = "RGBA" if has_alpha else "RGB"
+
+        sprites = [image.convert(mode) for image, _ in slots.values()]
+        placements, page_sizes = self.pack([(sprite.width * scale, sprite.height * scale) for sprite in sprites])
+
+        # The palette only needs the small sprites, so it is ready before any page exists
+        if has_alpha:
+            color_count = min(color_count, 255)
+        palette_img = self._shared_palette(sprites, color_count, palette_name)
+
+        page_contents = [[] for _ in page_sizes]
+        for (_, names), sprite, (page, x, y) in zip(slots.values(), sprites, placements):
+            page_contents[page].append((names, sprite, x, y))
+
+        pages = []
+        index = {}
+        for page_number, (size, contents) in enumerate(zip(page_sizes, page_contents)):
+            # Only one page and one sprite are held at full size before quantizing
+            page = Image.new(mode, size)
+            for names, sprite, x, y in contents:
+                pasted = ImageProcessor.upscale(sprite, scale) if scale > 1 else sprite
+                page.paste(pasted, (x, y))
+                for name in names:
+                    index[name] = {"page": page_number, "x": x, "y": y, "w": pasted.width, "h": pasted.height}
+            pages.append(self._quantize_page(page, palette_img))
+            page.close()
+
+        return pages, index
+
+    def _shared_palette(self, sprites, color_count, palette_name):
+        """Build one 'P' palette image used by every atlas page"""
+        if palette_name:
+            if palette_name not in ImageProcessor.PALETTES:
+                raise ValueError(f"Palette name must be one of: {', '.join(ImageProcessor.PALETTES.keys())}")
+            # Converted sprites are mapped to the whole palette, so the atlas keeps all of it (up to 255 colors)
+            return ImageProcessor.palette_image(palette_name)
+
+        # Gather the color histogram of all visible sprite pixels
+        histogram = {}
+        for sprite in sprites:
+            for count, color in sprite.getcolors(maxcolors=sprite.width * sprite.height):
+                if len(color) == 4:
+                    if color[3] < ImageProcessor.ALPHA_THRESHOLD:
+                        continue
+                    color = color[:3]
+                histogram[color] = histogram.get(color, 0) + count
+
+        colors = list(histogram)
+        if len(colors) <= color_count:
+            # Every color fits, so the atlas is lossless
+            return self._palette_image(colors or [(0, 0, 0)])
+
+        # Quantize a weighted sample of the histogram instead of the pages themselves
+        counts = np.array([histogram[color] for color in colors], dtype=np.float64)
+        scale = min(1.0, self.PALETTE_SAMPLE_LIMIT / counts.sum())
+        repeats = np.maximum(1, (counts * scale).astype(np.int64))
+        samples = np.repeat(np.array(colors, dtype=np.uint8), repeats, axis=0)
+        sample_img = Image.fromarray(samples.reshape(1, -1, 3), "RGB")
+        return sample_img.quantize(colors=color_count, dither=Image.Dither.NONE)
+
+    @staticmethod
+    def _palette_image(colors):
+        """Create a 'P' image carrying exactly the given palette"""
+        palette_img = Image.new('P', (1, 1))
+        palette_img.putpalette([c for color in colors for c in color])
+        return palette_img
+
+    @staticmethod
+    def _quantize_page(page, palette_img):
+        """Map a page to the shared palette, giving transparent pixels their own index"""
+        if page.mode != "RGBA":
+            return page.quantize(palette=palette_img, dither=Image.Dither.NONE)
+
+        flat_palette = palette_img.getpalette()
+        indices = np.array(page.convert("RGB").quantize(palette=palette_img, dither=Image.Dither.NONE))
+        transparent = len(flat_palette) // 3
+        indices[np.asarray(page)[:, :, 3] < ImageProcessor.ALPHA_THRESHOLD] = transparent
+
+        indexed = Image.fromarray(indices, "P")
+        indexed.putpalette(flat_palette + [0, 0, 0])
+        indexed.info["transparency"] = transparent
+        return indexed
+
+    @staticmethod
+    def save(pages, index, output_dir, basename="atlas"):
+        """
+        Write atlas pages and a JSON index of sprite coordinates.
+
+        Args:
+            pages (list): Atlas page images returned by build()
+            index (dict): Sprite index returned by build()
+            output_dir (str or Path): Directory to write into
+            basename (str): Prefix for the written files (default: "atlas")
+
+        Returns:
+            Path: Path of the written JSON index
+        """
+        output_dir = Path(output_dir)
+        page_entries = []
+        for i, page in enumerate(pages):
+            file_name = f"{basename}_{i}.png"
+            page.save(output_dir / file_name)
+            page_entries.append({"file": file_name, "width": page.width, "height": page.height})
+
+        index_path = output_dir / f"{basename}.json"
+        with open(index_path, "w") as f:
+            json.dump({"pages": page_entries, "sprites": index}, f, indent=2)
+
+        return index_path
@@ -0,0 +1,396 @@
+"""
+Batch conversion of image folders under a memory budget.
+"""
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+import hashlib
+import os
+import shutil
+import threading
+
+from PIL import Image
+
+from .processor import ImageProcessor
+from .atlas import AtlasPacker
+from .plan import ConversionPlan
+
+class MemoryScheduler:
+    """
+    Admit jobs only while their estimated memory fits a budget.
+
+    A job larger than the whole budget is still admitted once nothing else is
+    running, so oversized images are processed alone instead of blocking forever.
+    """
+
+    def __init__(self, budget):
+        """
+        Initialize the scheduler.
+
+        Args:
+            budget (int): Memory budget in bytes
+
+        Raises:
+            ValueError: If budget is invalid
+        """
+        if not isinstance(budget, int) or budget <= 0:
+            raise ValueError("Memory budget must be a positive integer")
+
+        self.budget = budget
+        self.in_use = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, cost, timeout=None):
+        """
+        Reserve memory for a job.
+
+        Args:
+            cost (int): Estimated bytes the job needs
+            timeout (float): Seconds to wait (default: None to wait forever)
+
+        Returns:
+            bool: True if the job was admitted
+        """
+        with self._condition:
+            admitted = self._condition.wait_for(
+                lambda: self.in_use == 0 or self.in_use + cost <= self.budget, timeout
+            )
+            if admitted:
+                self.in_use += cost
+            return admitted
+
+    def release(self, cost):
+        """
+        Return memory reserved by a finished job.
+
+        Args:
+            cost (int): The cost passed to acquire()
+        """
+        with self._condition:
+            self.in_use -= cost
+            self._condition.notify_all()
+
+class BatchProcessor:
+    """
+    Convert many image files with the same settings.
+
+    Jobs run on a thread pool but are only started while their estimated
+    decoded size fits the memory budget. Each job closes its source image and
+    drops intermediates as soon as the next stage no longer needs them.
+    """
+
+    IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.bmp', '.gif']
+
+    # Default memory budget for running jobs: 1 GiB
+    DEFAULT_MEMORY_BUDGET = 1 << 30
+
+    def __init__(self, pixel_size, color_count, dither_method="none", palette_name=None,
+                 filter_type="none", memory_budget=DEFAULT_MEMORY_BUDGET, max_workers=None, deduplicate=True):
+        """
+        Initialize the batch processor.
+
+        Args:
+            pixel_size (int): Size of pixels in the output
+            color_count (int): Number of colors in the output
+            dither_method (str): Dithering method to use (default: "none")
+            palette_name (str): Name of predefined palette to use (default: None for adaptive)
+            filter_type (str or FilterChain): Filter or comma-separated filter chain
+                applied after conversion (default: "none")
+            memory_budget (int): Bytes of decoded image data allowed at once (default: 1 GiB)
+            max_workers (int): Number of worker threads (default: None for one per CPU)
+            deduplicate (bool): Convert byte- or pixel-identical inputs only once (default: True)
+
+        Raises:
+            ValueError: If any setting is invalid
+        """
+        # Validated and compiled once, then shared by every job
+        self.plan = ConversionPlan(pixel_size, color_count, dither_method, palette_name, filter_type)
+
+        self.pixel_size = pixel_size
+        self.color_count = color_count
+        self.dither_method = dither_method
+        self.palette_name = palette_name
+        self.scheduler = MemoryScheduler(memory_budget)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.deduplicate = deduplicate
+        self.atlas_packer = AtlasPacker()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def find_images(input_dir):
+        """
+        Find image files directly inside a folder.
+
+        Args:
+            input_dir (str or Path): Folder to scan
+
+        Returns:
+            list: Sorted list of Path objects
+        """
+        return sorted(
+            path for path in Path(input_dir).iterdir()
+            if path.is_file() and path.suffix.lower() in BatchProcessor.IMAGE_EXTENSIONS
+        )
+
+    def estimate_footprint(self, path):
+        """
+        Estimate the peak memory of converting a file from its header alone.
+
+        Args:
+            path (str or Path): Image file
+
+        Returns:
+            int: Estimated bytes
+        """
+        with Image.open(path) as img:
+            pixels = img.width * img.height
+            # Pillow stores multi-band 8-bit images with 4 bytes per pixel
+            bands = len(img.getbands())
+            decoded = pixels * (4 if bands > 1 else 1)
+            if img.mode in ("I", "F", "I;16"):
+                decoded = pixels * 4
+            # downsample() makes an RGBA copy of other transparent images
+            converted = pixels * 4 if ImageProcessor.has_alpha(img) and img.mode != "RGBA" else 0
+            # pixel_digest() hashes a tobytes() copy of the decoded pixels
+            raw = pixels * (4 if img.mode in ("I", "F") else bands) if self.deduplicate else 0
+
+        # The upscaled output is a 'P' image with 1 byte per pixel
+        return decoded + converted + raw + pixels
+
+    def _finish(self, small, upscale=True):
+        """Quantize, filter and upscale a downsampled image, closing each intermediate"""
+        # Filters are per-color maps, so the plan only filters the palette
+        quantized = self.plan.quantize(small)
+        small.close()
+        if not upscale:
+            return quantized
+
+        processed = self.plan.upscale(quantized)
+        quantized.close()
+        return processed
+
+    @staticmethod
+    def file_digest(path):
+        """
+        Hash the bytes of a file.
+
+        Args:
+            path (str or Path): File to hash
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.blake2b()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def pixel_digest(image):
+        """
+        Hash the decoded pixels of an image.
+
+        Args:
+            image (PIL.Image): The image
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.blake2b(f"{image.mode}:{image.width}x{image.height}".encode())
+        if image.mode == "P":
+            digest.update(bytes(image.getpalette() or []))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def _run_job(self, path, output_dir, cost, keep, pixel_owners):
+        """
+        Convert and save one file, then give its memory back.
+
+        Returns (owner, processed): owner is the path of an earlier file with
+        the same pixels, in which case nothing was converted. With keep, the
+        result is returned as its block grid instead of being saved, so kept
+        results stay small after the job's memory is released.
+        """
+        try:
+            with Image.open(path) as img:
+                if pixel_owners is not None:
+                    img.load()
+                    with self._lock:
+                        owner = pixel_owners.setdefault(self.pixel_digest(img), path)
+                    if owner != path:
+                        return owner, None
+                small = self.plan.downsample(img)
+
+            processed = self._finish(small, upscale=not keep)
+            if keep:
+                # Reject sprites the atlas cannot hold before any of them are packed
+                self.atlas_packer.check_fits(processed.width * self.pixel_size, processed.height * self.pixel_size)
+                return None, processed
+            self._save(processed, self.output_path(path, output_dir))
+            processed.close()
+            return None, None
+        finally:
+            self.scheduler.release(cost)
+
+    def process_file(self, path, output_dir):
+        """
+        Convert one file and write the result, waiting for memory first.
+
+        Args:
+            path (str or Path): Image file
+            output_dir (str or Path): Directory to write into
+
+        Returns:
+            Path: Where the result was written
+        """
+        path = Path(path)
+        cost = self.estimate_footprint(path)
+        self.scheduler.acquire(cost)
+        self._run_job(path, output_dir, cost, False, None)
+        return self.output_path(path, output_dir)
+
+    @staticmethod
+    def output_path(path, output_dir):
+        """
+        Output file for an input file.
+
+        Args:
+            path (Path): Input image file
+            output_dir (str or Path): Directory to write into
+
+        Returns:
+            Path: Where the result is written
+        """
+        return Path(output_dir) / f"pixel_{path.name}"
+
+    @staticmethod
+    def _save(image, target):
+        """Write an image to a new file and move it over target"""
+        # Saving in place would write through a hardlink left by an earlier duplicate
+        temp = target.with_name(f".{target.stem}.tmp{target.suffix}")
+        try:
+            image.save(temp)
+            os.replace(temp, target)
+        finally:
+            if temp.exists():
+                temp.unlink()
+
+    def _write_duplicate(self, path, owner, output_dir):
+        """Reuse the output of owner for a duplicate input"""
+        source = self.output_path(owner, output_dir)
+        target = self.output_path(path, output_dir)
+        if target.exists():
+            target.unlink()
+
+        if source.suffix.lower() != target.suffix.lower():
+            # Same pixels but a different output format
+            with Image.open(source) as result:
+                self._save(result, target)
+            return
+
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+    def run(self, paths, output_dir, pack_atlas=False, progress=None):
+        """
+        Convert files and write the results.
+
+        Files with identical bytes, or identical decoded pixels, are converted
+        only once; the other copies get a hardlink or copy of the result.
+
+        Args:
+            paths (list): Image files to convert
+            output_dir (str or Path): Directory to write into
+            pack_atlas (bool): Write atlas pages instead of one file per image (default: False)
+            progress (callable): Called as progress(done, total, path) on the
+                calling thread after each file (default: None)
+
+        Returns:
+            dict: Summary with "processed", "total", "errors" (a list of
+                (file name, message) tuples), "duplicates" (inputs that
+                reused another result) and "saved_pixels" (source pixels
+                that did not need converting)
+        """
+        paths = [Path(path) for path in paths]
+        summary = {"processed": 0, "total": len(paths), "errors": [], "duplicates": 0, "saved_pixels": 0}
+        atlas_images = {}
+        pending = {}
+        duplicates = {}
+        failed = set()
+        byte_owners = {}
+        pixel_owners = {} if self.deduplicate else None
+
+        def report(path):
+            if progress:
+                done = summary["processed"] + len(summary["errors"]) + len(duplicates)
+                progress(done, summary["total"], path)
+
+        def collect(futures):
+            for future in futures:
+                path = pending.pop(future)
+                try:
+                    owner, result = future.result()
+                    if owner is not None:
+                        duplicates[path] = owner
+                    else:
+                        if pack_atlas:
+                            atlas_images[path.name] = result
+                        summary["processed"] += 1
+                except Exception as e:
+                    failed.add(path)
+                    summary["errors"].append((path.name, str(e)))
+                report(path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for path in paths:
+                try:
+                    if self.deduplicate:
+                        owner = byte_owners.setdefault(self.file_digest(path), path)
+                        if owner != path:
+                            duplicates[path] = owner
+                            report(path)
+                            continue
+                    cost = self.estimate_footprint(path)
+                except Exception as e:
+                    failed.add(path)
+                    summary["errors"].append((path.name, str(e)))
+                    continue
+
+                # Wait for memory, reporting finished jobs in the meantime
+                while not self.scheduler.acquire(cost, timeout=0.05):
+                    done = [future for future in pending if future.done()]
+                    collect(done)
+
+                future = executor.submit(self._run_job, path, output_dir, cost, pack_atlas, pixel_owners)
+                pending[future] = path
+                collect([future for future in pending if future.done()])
+
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                collect(done)
+
+        # Give every duplicate the result of its original
+        for path, owner in duplicates.items():
+            while owner in duplicates:
+                owner = duplicates[owner]
+            try:
+                if owner in failed:
+                    raise ValueError(f"duplicate of {owner.name}, which failed")
+                if pack_atlas:
+                    atlas_images[path.name] = atlas_images[owner.name]
+                else:
+                    self._write_duplicate(path, owner, output_dir)
+                with Image.open(path) as img:
+                    summary["saved_pixels"] += img.width * img.height
+                summary["duplicates"] += 1
+            except Exception as e:
+                summary["errors"].append((path.name, str(e)))
+
+        if atlas_images:
+            atlas_colors = 256 if self.color_count == "auto" else self.color_count
+            pages, index = self.atlas_packer.build(atlas_images, atlas_colors, self.palette_name, scale=self.pixel_size)
+            AtlasPacker.save(pages, index, output_dir)
+
+        return summary
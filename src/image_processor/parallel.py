@@ -0,0 +1,175 @@
+"""
+Tile-parallel conversion of a single large image.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
+
+from PIL import Image
+
+from .processor import ImageProcessor
+from .filters import FilterChain
+
+class TileParallelConverter:
+    """
+    Convert one image using a thread pool over horizontal tiles.
+
+    Tiles are bands of whole output rows, so every tile boundary falls on a
+    pixel_size block boundary. Each tile is downsampled from a crop of the
+    source with enough margin for the LANCZOS kernel, so the result matches a
+    full-image resize to within rounding. Adaptive palettes are quantized once on
+    the assembled downsample, which is pixel_size squared times smaller than
+    the source; mapping to a fixed palette, filtering and upscaling run per tile.
+    """
+
+    # LANCZOS kernel support in output pixels
+    LANCZOS_SUPPORT = 3
+
+    def __init__(self, max_workers=None, tiles_per_worker=4):
+        """
+        Initialize the converter.
+
+        Args:
+            max_workers (int): Number of worker threads (default: None for one per CPU)
+            tiles_per_worker (int): Tiles created per worker for load balancing (default: 4)
+
+        Raises:
+            ValueError: If tiles_per_worker is invalid
+        """
+        if not isinstance(tiles_per_worker, int) or tiles_per_worker <= 0:
+            raise ValueError("Tiles per worker must be a positive integer")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.tiles_per_worker = tiles_per_worker
+
+    def _bands(self, rows):
+        """Split a number of rows into contiguous (start, end) bands"""
+        count = max(1, min(rows, self.max_workers * self.tiles_per_worker))
+        step = math.ceil(rows / count)
+        return [(start, min(rows, start + step)) for start in range(0, rows, step)]
+
+    def convert(self, image, pixel_size, color_count, dither_method="none", palette_name=None, filter_type="none"):
+        """
+        Convert an image to pixel art style using all workers.
+
+        Args:
+            image (PIL.Image): The source image
+            pixel_size (int): Size of pixels in the output
+            color_count (int): Number of colors in the output
+            dither_method (str): Dithering method to use (default: "none")
+            palette_name (str): Name of predefined palette to use (default: None for adaptive)
+            filter_type (str or FilterChain): Filter or filter chain applied to the result (default: "none")
+
+        Returns:
+            PIL.Image: The processed pixel art image
+
+        Raises:
+            ValueError: If input parameters are invalid
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+
+        ImageProcessor.validate_settings(pixel_size, color_count, dither_method, palette_name)
+        # Parse the chain once rather than in every tile
+        filter_type = filter_type if isinstance(filter_type, FilterChain) else FilterChain(filter_type)
+
+        # Decode once up front; lazy loading is not safe across threads
+        image.load()
+        if ImageProcessor.has_alpha(image):
+            image = image.convert("RGBA") if image.mode != "RGBA" else image
+        elif image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        width = max(1, image.width // pixel_size)
+        height = max(1, image.height // pixel_size)
+        bands = self._bands(height)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Downsample each band of output rows
+            small = Image.new(image.mode, (width, height))
+            scale = image.height / height
+            tiles = executor.map(lambda band: self._downsample_band(image, width, scale, band), bands)
+            for (start, _), tile in zip(bands, tiles):
+                small.paste(tile, (0, start))
+
+            if palette_name and dither_method == "none" and small.mode != "RGBA":
+                # Mapping to a fixed palette is per pixel, so bands can be mapped independently
+                palette_img = ImageProcessor.palette_image(palette_name)
+                tiles = executor.map(
+                    lambda band: small.crop((0, band[0], width, band[1])).quantize(
+                        palette=palette_img, dither=Image.Dither.NONE),
+                    bands
+                )
+            else:
+                # Adaptive palettes, alpha thresholding and error diffusion need the whole grid;
+                # quantizing the (small) grid once already gives the mapping, so tiles reuse it
+                quantized = ImageProcessor.reduce_colors(small, color_count, dither_method, palette_name)
+                tiles = [quantized.crop((0, start, width, end)) for start, end in bands]
+
+            # Filter and upscale each tile
+            tiles = list(executor.map(lambda tile: self._finish_tile(tile, pixel_size, filter_type), tiles))
+            processed = Image.new(tiles[0].mode, (width * pixel_size, height * pixel_size))
+            if processed.mode == "P":
+                processed.putpalette(tiles[0].getpalette())
+                processed.info.update(tiles[0].info)
+            for (start, _), tile in zip(bands, tiles):
+                processed.paste(tile, (0, start * pixel_size))
+
+        return processed
+
+    def _downsample_band(self, image, width, scale, band):
+        """LANCZOS downsample of output rows [start, end) from a cropped source band"""
+        start, end = band
+        top, bottom = start * scale, end * scale
+        margin = math.ceil(self.LANCZOS_SUPPORT * scale) + 1
+        crop_top = max(0, math.floor(top) - margin)
+        crop_bottom = min(image.height, math.ceil(bottom) + margin)
+
+        source = image.crop((0, crop_top, image.width, crop_bottom))
+        box = (0, top - crop_top, image.width, bottom - crop_top)
+        return source.resize((width, end - start), Image.Resampling.LANCZOS, box=box)
+
+    @staticmethod
+    def _finish_tile(tile, pixel_size, filter_type):
+        """Filter a quantized tile on its block grid, then upscale it"""
+        if filter_type:
+            tile = ImageProcessor.apply_filter(tile, filter_type)
+        return ImageProcessor.upscale(tile, pixel_size)
+
+    def apply_filter(self, image, filter_type):
+        """
+        Apply a filter to an image, one band of rows per task.
+
+        Args:
+            image (PIL.Image): The source image
+            filter_type (str or FilterChain): Filter or filter chain to apply
+
+        Returns:
+            PIL.Image: The filtered image
+
+        Raises:
+            ValueError: If filter_type is invalid
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+
+        filter_type = filter_type if isinstance(filter_type, FilterChain) else FilterChain(filter_type)
+        if image.mode == "P":
+            # Only the palette is filtered, so there is nothing to split
+            return ImageProcessor.apply_filter(image, filter_type)
+
+        image.load()
+        bands = self._bands(image.height)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            tiles = list(executor.map(
+                lambda band: ImageProcessor.apply_filter(image.crop((0, band[0], image.width, band[1])), filter_type),
+                bands
+            ))
+
+        filtered = Image.new(tiles[0].mode, image.size)
+        filtered.info.update(tiles[0].info)
+        for (start, _), tile in zip(bands, tiles):
+            filtered.paste(tile, (0, start))
+        return filtered
@@ -0,0 +1,136 @@
+"""
+Precompiled conversion settings for converting many images the same way.
+"""
+from PIL import Image
+
+from .processor import ImageProcessor
+from .filters import FilterChain
+
+class ConversionPlan:
+    """
+    Conversion settings validated and compiled once, then reused per image.
+
+    Building a plan validates the settings and resolves everything that does
+    not depend on the image: the dither enum, the cached palette image of a
+    fixed palette, and the fused filter chain with its color matrices and
+    lookup tables. For a fixed palette, the palette is filtered once up front
+    and results only get the filtered palette swapped in. Converting an image
+    then only does the per-image work: downsample, quantize and upscale.
+    """
+
+    def __init__(self, pixel_size, color_count, dither_method="none", palette_name=None, filter_type="none"):
+        """
+        Validate and compile conversion settings.
+
+        Args:
+            pixel_size (int): Size of pixels in the output
+            color_count (int or str): Number of colors in the output, or "auto"
+            dither_method (str): Dithering method to use (default: "none")
+            palette_name (str): Name of predefined palette to use (default: None for adaptive)
+            filter_type (str or FilterChain): Filter or comma-separated filter chain
+                applied after color reduction (default: "none")
+
+        Raises:
+            ValueError: If any setting is invalid
+        """
+        ImageProcessor.validate_settings(pixel_size, color_count, dither_method, palette_name)
+
+        self.pixel_size = pixel_size
+        self.color_count = color_count
+        self.dither_method = dither_method
+        self.palette_name = palette_name or None
+        self.filter_chain = filter_type if isinstance(filter_type, FilterChain) else FilterChain(filter_type)
+
+        self.dither = ImageProcessor.DITHER_METHODS[dither_method]
+        self.palette_image = None
+        self._quantize_colors = color_count
+        # Source mode -> filtered palette that replaces the palette of every result
+        self._filtered_palettes = {}
+
+        if self.palette_name:
+            self.palette_image = ImageProcessor.palette_image(self.palette_name)
+            colors = ImageProcessor.PALETTES[self.palette_name][:len(self.palette_image.getpalette()) // 3]
+            self._quantize_colors = len(colors)
+            if self.filter_chain:
+                # Results carry the whole palette, RGBA results followed by a black transparent entry
+                self._filtered_palettes = {
+                    "RGB": self._filter_colors(colors),
+                    "RGBA": self._filter_colors(colors + [(0, 0, 0)]),
+                }
+
+    def _filter_colors(self, colors):
+        """Run colors through the filter chain; returns a flat palette list"""
+        palette_strip = Image.frombytes("RGB", (len(colors), 1), bytes(c for color in colors for c in color))
+        return list(ImageProcessor.apply_filter(palette_strip, self.filter_chain).tobytes())
+
+    def downsample(self, image):
+        """
+        Shrink an image so that each output pixel covers one pixel_size block.
+
+        Args:
+            image (PIL.Image): The source image
+
+        Returns:
+            PIL.Image: The downsampled image
+        """
+        return ImageProcessor.downsample(image, self.pixel_size)
+
+    def quantize(self, small):
+        """
+        Reduce the colors of a downsampled image and apply the filter chain.
+
+        Args:
+            small (PIL.Image): The downsampled image
+
+        Returns:
+            PIL.Image: The quantized 'P' mode image
+        """
+        if self.color_count == "auto":
+            quantized = ImageProcessor.reduce_colors(small, "auto", self.dither_method, self.palette_name)
+        elif small.mode == "RGBA":
+            quantized = ImageProcessor.reduce_colors(small, self.color_count, self.dither_method, self.palette_name)
+        else:
+            quantized = small.quantize(colors=self._quantize_colors, palette=self.palette_image, dither=self.dither)
+
+        filtered_palette = self._filtered_palettes.get(small.mode)
+        if filtered_palette is not None:
+            quantized.putpalette(filtered_palette)
+        elif self.filter_chain:
+            filtered = ImageProcessor.apply_filter(quantized, self.filter_chain)
+            quantized.close()
+            quantized = filtered
+        return quantized
+
+    def upscale(self, small):
+        """
+        Enlarge a quantized image back to blocks of pixel_size.
+
+        Args:
+            small (PIL.Image): The quantized image
+
+        Returns:
+            PIL.Image: The upscaled image
+        """
+        return ImageProcessor.upscale(small, self.pixel_size)
+
+    def convert(self, image, upscale=True):
+        """
+        Convert an image to pixel art with the compiled settings.
+
+        Args:
+            image (PIL.Image): The source image
+            upscale (bool): Return the full-size image rather than the block grid (default: True)
+
+        Returns:
+            PIL.Image: The processed pixel art image
+
+        Raises:
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+
+        quantized = self.quantize(self.downsample(image))
+        if not upscale:
+            return quantized
+        return self.upscale(quantized)
@@ -1,6 +1,10 @@
+from functools import lru_cache
+
 from PIL import Image
 import numpy as np
 
+from .filters import FilterChain
+
 class ImageProcessor:
     # Predefined color palettes
     PALETTES = {
@@ -34,6 +38,12 @@ class ImageProcessor:
         "floyd-steinberg": Image.Dither.FLOYDSTEINBERG
     }
     
+    # Blocks with at least this much alpha are opaque, the rest transparent
+    ALPHA_THRESHOLD = 128
+    
+    # Quality target (PSNR in dB) for the "auto" color count
+    AUTO_COLOR_PSNR = 32.0
+    
     @staticmethod
     def convert_to_pixel_art(image, pixel_size, color_count, dither_method="none", palette_name=None):
         """
@@ -42,7 +52,8 @@ class ImageProcessor:
         Args:
             image (PIL.Image): The source image
             pixel_size (int): Size of pixels in the output
-            color_count (int): Number of colors in the output
+            color_count (int or str): Number of colors in the output, or "auto"
+                for the fewest colors that reach AUTO_COLOR_PSNR
             dither_method (str): Dithering method to use (default: "none")
             palette_name (str): Name of predefined palette to use (default: None for adaptive)
             
@@ -57,60 +68,302 @@ class ImageProcessor:
         if not isinstance(image, Image.Image):
             raise TypeError("Expected a PIL Image object")
         
+        ImageProcessor.validate_settings(pixel_size, color_count, dither_method, palette_name)
+        
+        small = ImageProcessor.downsample(image, pixel_size)
+        small = ImageProcessor.reduce_colors(small, color_count, dither_method, palette_name)
+        return ImageProcessor.upscale(small, pixel_size)
+    
+    @staticmethod
+    def validate_settings(pixel_size, color_count, dither_method="none", palette_name=None):
+        """
+        Check pixel art conversion settings.
+        
+        Args:
+            pixel_size (int): Size of pixels in the output
+            color_count (int or str): Number of colors in the output, or "auto"
+            dither_method (str): Dithering method to use (default: "none")
+            palette_name (str): Name of predefined palette to use (default: None for adaptive)
+            
+        Raises:
+            ValueError: If any setting is invalid
+        """
         if not isinstance(pixel_size, int) or pixel_size <= 0:
             raise ValueError("Pixel size must be a positive integer")
             
-        if not isinstance(color_count, int) or color_count <= 0 or color_count > 256:
-            raise ValueError("Color count must be an integer between 1 and 256")
+        if color_count != "auto" and (not isinstance(color_count, int) or color_count <= 0 or color_count > 256):
+            raise ValueError("Color count must be an integer between 1 and 256, or \"auto\"")
         
         if dither_method not in ImageProcessor.DITHER_METHODS:
             raise ValueError(f"Dither method must be one of: {', '.join(ImageProcessor.DITHER_METHODS.keys())}")
         
+        if palette_name and palette_name not in ImageProcessor.PALETTES:
+            raise ValueError(f"Palette name must be one of: {', '.join(ImageProcessor.PALETTES.keys())}")
+    
+    @staticmethod
+    def downsample(image, pixel_size):
+        """
+        Shrink an image so that each output pixel covers one pixel_size block.
+        
+        Args:
+            image (PIL.Image): The source image
+            pixel_size (int): Size of pixels in the output
+            
+        Returns:
+            PIL.Image: The downsampled image
+        """
+        # Images with any kind of transparency go through the RGBA pipeline
+        if ImageProcessor.has_alpha(image) and image.mode != "RGBA":
+            image = image.convert("RGBA")
+        
         # Calculate new dimensions
         width = max(1, image.width // pixel_size)
         height = max(1, image.height // pixel_size)
         
         # Resize image to smaller size
-        small = image.resize((width, height), Image.Resampling.LANCZOS)
+        return image.resize((width, height), Image.Resampling.LANCZOS)
+    
+    @staticmethod
+    def reduce_colors(small, color_count, dither_method="none", palette_name=None):
+        """
+        Reduce the colors of a downsampled image.
         
-        # Apply color reduction
-        if palette_name:
-            if palette_name not in ImageProcessor.PALETTES:
-                raise ValueError(f"Palette name must be one of: {', '.join(ImageProcessor.PALETTES.keys())}")
-            
-            # Create a new image with the palette
-            palette_img = Image.new('P', (1, 1))
-            flat_palette = [c for color in ImageProcessor.PALETTES[palette_name] for c in color]
-            palette_img.putpalette(flat_palette + [0] * (768 - len(flat_palette)))
+        Args:
+            small (PIL.Image): The downsampled image
+            color_count (int or str): Number of colors in the output, or "auto"
+            dither_method (str): Dithering method to use (default: "none")
+            palette_name (str): Name of predefined palette to use (default: None for adaptive)
             
+        Returns:
+            PIL.Image: The quantized 'P' mode image
+        """
+        if color_count == "auto":
+            return ImageProcessor._search_color_count(small, dither_method, palette_name)[1]
+        
+        if small.mode == "RGBA":
+            return ImageProcessor._reduce_colors_alpha(small, color_count, dither_method, palette_name)
+        
+        dither = ImageProcessor.DITHER_METHODS[dither_method]
+        
+        if palette_name:
             # Convert using the custom palette
-            dither = ImageProcessor.DITHER_METHODS[dither_method]
-            small = small.quantize(colors=min(color_count, len(ImageProcessor.PALETTES[palette_name])), 
+            palette_img = ImageProcessor.palette_image(palette_name)
+            return small.quantize(colors=min(color_count, len(ImageProcessor.PALETTES[palette_name])), 
                                   palette=palette_img, dither=dither)
+        
+        # Use adaptive palette
+        return small.quantize(colors=color_count, dither=dither)
+    
+    @staticmethod
+    def psnr(reference, quantized):
+        """
+        Peak signal-to-noise ratio between a downsampled image and its quantized version.
+        
+        Transparent blocks of RGBA references are ignored.
+        
+        Args:
+            reference (PIL.Image): The downsampled image before color reduction
+            quantized (PIL.Image): The color reduced image of the same size
+            
+        Returns:
+            float: PSNR in dB (infinity for identical images)
+        """
+        expected = np.asarray(reference.convert("RGB"), dtype=np.float32)
+        actual = np.asarray(quantized.convert("RGB"), dtype=np.float32)
+        
+        if reference.mode == "RGBA":
+            opaque = np.asarray(reference)[:, :, 3] >= ImageProcessor.ALPHA_THRESHOLD
+            expected, actual = expected[opaque], actual[opaque]
+        
+        mse = float(np.mean((expected - actual) ** 2)) if expected.size else 0.0
+        if mse == 0:
+            return float("inf")
+        return float(10 * np.log10(255 ** 2 / mse))
+    
+    @staticmethod
+    def auto_color_count(small, dither_method="none", palette_name=None, target_psnr=None):
+        """
+        Find the fewest colors whose quantization reaches a quality target.
+        
+        The search runs on the downsampled image, so each probe is cheap.
+        
+        Args:
+            small (PIL.Image): The downsampled image
+            dither_method (str): Dithering method to use (default: "none")
+            palette_name (str): Name of predefined palette to use (default: None for adaptive)
+            target_psnr (float): Quality target in dB (default: None for AUTO_COLOR_PSNR)
+            
+        Returns:
+            int: The chosen color count
+        """
+        return ImageProcessor._search_color_count(small, dither_method, palette_name, target_psnr)[0]
+    
+    @staticmethod
+    def _search_color_count(small, dither_method, palette_name, target_psnr=None):
+        """Binary search the color count; returns (count, quantized image)"""
+        if target_psnr is None:
+            target_psnr = ImageProcessor.AUTO_COLOR_PSNR
+        
+        if palette_name:
+            # A fixed palette is always mapped as a whole
+            count = len(ImageProcessor.PALETTES[palette_name])
+            return count, ImageProcessor.reduce_colors(small, count, dither_method, palette_name)
+        
+        low, high = 1, 255 if small.mode == "RGBA" else 256
+        best = (high, ImageProcessor.reduce_colors(small, high, dither_method))
+        if ImageProcessor.psnr(small, best[1]) < target_psnr:
+            # Even the most colors miss the target
+            return best
+        
+        while low < high:
+            middle = (low + high) // 2
+            probe = ImageProcessor.reduce_colors(small, middle, dither_method)
+            if ImageProcessor.psnr(small, probe) >= target_psnr:
+                best = (middle, probe)
+                high = middle
+            else:
+                low = middle + 1
+        return best
+    
+    @staticmethod
+    def _reduce_colors_alpha(small, color_count, dither_method, palette_name):
+        """
+        Reduce the colors of a downsampled RGBA image.
+        
+        Each block is made fully opaque or fully transparent by thresholding
+        its alpha. The palette is estimated from opaque blocks only and one
+        extra palette entry is reserved for transparency.
+        """
+        rgba = np.asarray(small)
+        opaque = rgba[:, :, 3] >= ImageProcessor.ALPHA_THRESHOLD
+        dither = ImageProcessor.DITHER_METHODS[dither_method]
+        
+        # Leave one index free for transparency
+        visible = min(color_count, 255)
+        opaque_pixels = Image.fromarray(np.ascontiguousarray(rgba[opaque][:, :3]).reshape(1, -1, 3), "RGB")
+        
+        if palette_name:
+            # The whole fixed palette, as for RGB sources; it always leaves an index free
+            palette_img = ImageProcessor.palette_image(palette_name)
+            colors = ImageProcessor.PALETTES[palette_name][:len(palette_img.getpalette()) // 3]
+            mapped = opaque_pixels.quantize(palette=palette_img, dither=Image.Dither.NONE) if opaque.any() else None
+        elif opaque.any():
+            # Adaptive palette from opaque pixels only; the mapping comes for free
+            mapped = opaque_pixels.quantize(colors=visible, dither=Image.Dither.NONE)
+            flat_palette = mapped.getpalette()
+            colors = [tuple(flat_palette[i:i + 3]) for i in range(0, len(flat_palette), 3)][:visible]
         else:
-            # Use adaptive palette
-            dither = ImageProcessor.DITHER_METHODS[dither_method]
-            small = small.quantize(colors=color_count, dither=dither)
+            colors, mapped = [(0, 0, 0)], None
         
-        # Resize back to original size
-        processed = small.resize(
-            (width * pixel_size, height * pixel_size),
+        indices = np.zeros(opaque.shape, dtype=np.uint8)
+        if dither != Image.Dither.NONE and mapped is not None:
+            # Error diffusion needs the 2D layout; hidden colors under transparency must not diffuse into it
+            palette_img = ImageProcessor._palette_from_colors(colors)
+            filled = Image.fromarray(ImageProcessor._fill_transparent(rgba[:, :, :3], opaque), "RGB")
+            indices[:] = np.asarray(filled.quantize(palette=palette_img, dither=dither))
+        elif mapped is not None:
+            indices[opaque] = np.asarray(mapped).ravel()
+        
+        transparent = len(colors)
+        indices[~opaque] = transparent
+        
+        result = Image.fromarray(indices, "P")
+        result.putpalette([c for color in colors for c in color] + [0, 0, 0])
+        result.info["transparency"] = transparent
+        return result
+    
+    @staticmethod
+    def _fill_transparent(rgb, opaque):
+        """Give every transparent pixel the color of a nearby opaque pixel; opaque must not be empty"""
+        # Along rows that have opaque pixels, take the nearest one in the same row
+        rows = opaque.any(axis=1)
+        columns = ImageProcessor._nearest_true(opaque[rows])
+        filled = rgb.copy()
+        filled[rows] = np.take_along_axis(rgb[rows], columns[:, :, np.newaxis], axis=1)
+        # Fully transparent rows copy the nearest row that has opaque pixels
+        return filled[ImageProcessor._nearest_true(rows[np.newaxis])[0]]
+    
+    @staticmethod
+    def _nearest_true(mask):
+        """Index of the nearest True entry along each row of a 2D mask; every row needs one"""
+        width = mask.shape[1]
+        positions = np.arange(width)
+        before = np.maximum.accumulate(np.where(mask, positions, -1), axis=1)
+        after = np.minimum.accumulate(np.where(mask, positions, 2 * width)[:, ::-1], axis=1)[:, ::-1]
+        return np.where((before < 0) | (after - positions < positions - before), after, before)
+    
+    @staticmethod
+    def has_alpha(image):
+        """
+        Check whether an image carries transparency.
+        
+        Args:
+            image (PIL.Image): The image
+            
+        Returns:
+            bool: True if the image has an alpha channel or a transparent color
+        """
+        return image.mode in ("RGBA", "LA", "PA", "RGBa", "La") or "transparency" in image.info
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def palette_image(palette_name):
+        """
+        Create a 'P' image carrying a predefined palette, for use with quantize.
+        
+        The palette is used whole, up to 255 colors so that one index is always
+        free for transparency. The image is cached per palette and shared, so
+        callers must not modify it.
+        
+        Args:
+            palette_name (str): Name of predefined palette
+            
+        Returns:
+            PIL.Image: 1x1 'P' mode image with the palette
+        """
+        return ImageProcessor._palette_from_colors(ImageProcessor.PALETTES[palette_name][:255])
+    
+    @staticmethod
+    def _palette_from_colors(colors):
+        """Create a 'P' image whose palette holds exactly the given colors"""
+        palette_img = Image.new('P', (1, 1))
+        # No padding entries, so quantize can only pick real palette colors
+        palette_img.putpalette([c for color in colors for c in color])
+        return palette_img
+    
+    @staticmethod
+    def upscale(small, pixel_size):
+        """
+        Enlarge a downsampled image back to blocks of pixel_size.
+        
+        Args:
+            small (PIL.Image): The downsampled image
+            pixel_size (int): Size of pixels in the output
+            
+        Returns:
+            PIL.Image: The upscaled image
+        """
+        return small.resize(
+            (small.width * pixel_size, small.height * pixel_size),
             Image.Resampling.NEAREST
         )
-        
-        return processed
     
     @staticmethod
     def apply_filter(image, filter_type):
         """
-        Apply a filter to an image.
+        Apply a filter or a chain of filters to an image.
+        
+        RGB images are filtered in one fused pass per FilterChain segment.
+        RGBA images only have their visible pixels filtered, and 'P' images
+        have their palette filtered.
         
         Args:
             image (PIL.Image): The source image
-            filter_type (str): Type of filter to apply
+            filter_type (str or FilterChain): Filter to apply, a comma-separated
+                chain such as "grayscale,contrast:1.2", or a FilterChain
             
         Returns:
-            PIL.Image: The filtered image
+            PIL.Image: The filtered image, or image itself for an empty chain
             
         Raises:
             ValueError: If filter_type is invalid
@@ -119,41 +372,31 @@ class ImageProcessor:
         if not isinstance(image, Image.Image):
             raise TypeError("Expected a PIL Image object")
         
-        # Convert to numpy array for easier manipulation
-        img_array = np.array(image)
+        chain = filter_type if isinstance(filter_type, FilterChain) else FilterChain(filter_type)
+        if not chain:
+            return image
         
-        if filter_type == "invert":
-            # Invert colors
-            if image.mode == "RGB":
-                img_array = 255 - img_array
-            else:
-                raise ValueError("Invert filter only works with RGB images")
-        
-        elif filter_type == "sepia":
-            # Apply sepia tone
-            if image.mode == "RGB":
-                r, g, b = img_array[:,:,0], img_array[:,:,1], img_array[:,:,2]
-                new_r = np.minimum(0.393 * r + 0.769 * g + 0.189 * b, 255).astype(np.uint8)
-                new_g = np.minimum(0.349 * r + 0.686 * g + 0.168 * b, 255).astype(np.uint8)
-                new_b = np.minimum(0.272 * r + 0.534 * g + 0.131 * b, 255).astype(np.uint8)
-                img_array = np.stack((new_r, new_g, new_b), axis=2)
-            else:
-                raise ValueError("Sepia filter only works with RGB images")
-        
-        elif filter_type == "grayscale":
-            # Convert to grayscale
-            if image.mode == "RGB":
-                r, g, b = img_array[:,:,0], img_array[:,:,1], img_array[:,:,2]
-                gray = (0.2989 * r + 0.5870 * g + 0.1140 * b).astype(np.uint8)
-                img_array = np.stack((gray, gray, gray), axis=2)
-            else:
-                raise ValueError("Grayscale filter only works with RGB images")
+        if image.mode == "P":
+            # Filter the palette instead of every pixel; indices and transparency are kept
+            flat_palette = image.getpalette()
+            palette_strip = Image.frombytes("RGB", (len(flat_palette) // 3, 1), bytes(flat_palette))
+            filtered = image.copy()
+            filtered.putpalette(ImageProcessor.apply_filter(palette_strip, chain).tobytes())
+            return filtered
         
-        else:
-            raise ValueError(f"Unknown filter type: {filter_type}")
+        if image.mode == "RGBA":
+            # Filter only visible pixels and keep the alpha channel as is
+            result = np.array(image)
+            visible = result[:, :, 3] > 0
+            visible_pixels = Image.fromarray(np.ascontiguousarray(result[visible][:, :3]).reshape(1, -1, 3), "RGB")
+            result[visible, :3] = np.asarray(ImageProcessor.apply_filter(visible_pixels, chain)).reshape(-1, 3)
+            return Image.fromarray(result, "RGBA")
+        
+        if image.mode != "RGB":
+            name = chain.filters[0].partition(":")[0].capitalize() if len(chain.filters) == 1 else "Chained"
+            raise ValueError(f"{name} filter only works with RGB images")
         
-        # Convert back to PIL Image
-        return Image.fromarray(img_array)
+        return chain.apply_rgb(image)
     
     @staticmethod
     def resize_with_aspect_ratio(image, target_size):
@@ -182,4 +425,44 @@ class ImageProcessor:
             
         ratio = min(target_size[0] / image.width, target_size[1] / image.height)
         new_size = (int(image.width * ratio), int(image.height * ratio))
-        return image.resize(new_size, Image.Resampling.LANCZOS) 
\ No newline at end of file
+        return image.resize(new_size, Image.Resampling.LANCZOS)
+    
+    @staticmethod
+    def resize_nearest_integer(image, target_size):
+        """
+        Scale image by an integer factor to fit target size, keeping hard pixel edges.
+        
+        Images smaller than the target are enlarged by the largest whole factor
+        that fits, larger ones are shrunk by the smallest whole factor that fits.
+        NEAREST resampling keeps the pixel grid of pixel art sharp.
+        
+        Args:
+            image (PIL.Image): The source image
+            target_size (tuple): Target width and height
+            
+        Returns:
+            PIL.Image: Resized image
+            
+        Raises:
+            ValueError: If target_size is invalid
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+            
+        if not isinstance(target_size, tuple) or len(target_size) != 2:
+            raise ValueError("Target size must be a tuple of (width, height)")
+            
+        if target_size[0] <= 0 or target_size[1] <= 0:
+            raise ValueError("Target dimensions must be positive")
+        
+        if image.width <= target_size[0] and image.height <= target_size[1]:
+            factor = min(target_size[0] // image.width, target_size[1] // image.height)
+            new_size = (image.width * factor, image.height * factor)
+        else:
+            divisor = max(-(-image.width // target_size[0]), -(-image.height // target_size[1]))
+            new_size = (max(1, image.width // divisor), max(1, image.height // divisor))
+        
+        if new_size == image.size:
+            return image
+        return image.resize(new_size, Image.Resampling.NEAREST)
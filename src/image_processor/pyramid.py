@@ -0,0 +1,123 @@
+"""
+Multi-resolution image pyramid for fast interactive pixel size changes.
+"""
+import threading
+
+from PIL import Image
+
+from .processor import ImageProcessor
+
+class ResolutionPyramid:
+    """
+    Cache of progressively halved copies of a source image.
+
+    A downsample for any pixel size starts from the smallest cached level that
+    is still at least as large as the target, so the final LANCZOS resample
+    only ever shrinks by less than a factor of two. Levels can be built on a
+    background thread; until they are ready, requests fall back to the largest
+    level available.
+    """
+
+    # Modes that Image.reduce can box-filter
+    REDUCIBLE_MODES = ("L", "LA", "RGB", "RGBA")
+
+    def __init__(self, image, min_size=8, background=True):
+        """
+        Initialize the pyramid.
+
+        Args:
+            image (PIL.Image): The source image
+            min_size (int): Stop halving once either side would drop below this (default: 8)
+            background (bool): Build levels on a background thread (default: True)
+
+        Raises:
+            ValueError: If min_size is invalid
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+
+        if not isinstance(min_size, int) or min_size <= 0:
+            raise ValueError("Minimum size must be a positive integer")
+
+        image.load()
+        if ImageProcessor.has_alpha(image) and image.mode != "RGBA":
+            image = image.convert("RGBA")
+        self.image = image
+        self.min_size = min_size
+
+        # levels[k] is the source reduced by a factor of 2 ** k
+        self._levels = [image]
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._thread = None
+
+        if background:
+            self._thread = threading.Thread(target=self.build, daemon=True)
+            self._thread.start()
+        else:
+            self.build()
+
+    def build(self):
+        """Build all remaining levels"""
+        if self.image.mode not in self.REDUCIBLE_MODES:
+            return
+
+        while not self._cancelled:
+            with self._lock:
+                last = self._levels[-1]
+            if min(last.width, last.height) // 2 < self.min_size:
+                return
+
+            level = last.reduce(2)
+            with self._lock:
+                self._levels.append(level)
+
+    def wait(self, timeout=None):
+        """
+        Wait for the background build to finish.
+
+        Args:
+            timeout (float): Seconds to wait (default: None to wait forever)
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def cancel(self):
+        """Stop building further levels"""
+        self._cancelled = True
+
+    @property
+    def level_count(self):
+        """Number of levels built so far"""
+        with self._lock:
+            return len(self._levels)
+
+    def downsample(self, pixel_size):
+        """
+        Shrink the source so that each output pixel covers one pixel_size block.
+
+        Args:
+            pixel_size (int): Size of pixels in the output
+
+        Returns:
+            PIL.Image: Image of the same size as ImageProcessor.downsample would give
+
+        Raises:
+            ValueError: If pixel_size is invalid
+        """
+        if not isinstance(pixel_size, int) or pixel_size <= 0:
+            raise ValueError("Pixel size must be a positive integer")
+
+        width = max(1, self.image.width // pixel_size)
+        height = max(1, self.image.height // pixel_size)
+
+        # Deepest level whose reduction factor does not exceed pixel_size
+        with self._lock:
+            depth = min(pixel_size.bit_length() - 1, len(self._levels) - 1)
+            level = self._levels[depth]
+
+        # reduce() rounds odd sizes up, so only part of a level maps onto the source
+        scale = 2 ** depth
+        box = (0, 0, self.image.width / scale, self.image.height / scale)
+        return level.resize((width, height), Image.Resampling.LANCZOS, box=box)
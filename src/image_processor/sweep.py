@@ -0,0 +1,179 @@
+"""
+Parameter sweeps over pixel art conversion settings.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+import math
+
+from PIL import Image, ImageDraw
+
+from .processor import ImageProcessor
+
+class ParameterSweep:
+    """
+    Convert one image with many combinations of settings.
+
+    The expensive LANCZOS downsample runs once per pixel size and is shared by
+    every color count, dither method and palette. Combinations that would give
+    identical output (e.g. a fixed palette asked for more colors than it has)
+    are only computed once.
+    """
+
+    def __init__(self, pixel_sizes, color_counts, dither_methods=("none",), palette_names=(None,), max_workers=None):
+        """
+        Initialize the sweep.
+
+        Args:
+            pixel_sizes (list): Pixel sizes to try
+            color_counts (list): Color counts to try
+            dither_methods (list): Dithering methods to try (default: ("none",))
+            palette_names (list): Palette names to try, None for adaptive (default: (None,))
+            max_workers (int): Number of worker threads (default: None for the executor default)
+
+        Raises:
+            ValueError: If any setting is invalid
+        """
+        self.pixel_sizes = list(dict.fromkeys(pixel_sizes))
+        self.color_counts = list(dict.fromkeys(color_counts))
+        self.dither_methods = list(dict.fromkeys(dither_methods))
+        self.palette_names = list(dict.fromkeys(palette_names))
+        self.max_workers = max_workers
+
+        if not (self.pixel_sizes and self.color_counts and self.dither_methods and self.palette_names):
+            raise ValueError("Every sweep dimension needs at least one value")
+
+        for pixel_size, color_count, dither_method, palette_name in self.combinations():
+            ImageProcessor.validate_settings(pixel_size, color_count, dither_method, palette_name)
+
+    def combinations(self):
+        """
+        List every combination of settings in the sweep.
+
+        Returns:
+            list: (pixel_size, color_count, dither_method, palette_name) tuples
+        """
+        return list(product(self.pixel_sizes, self.color_counts, self.dither_methods, self.palette_names))
+
+    def run(self, image):
+        """
+        Run the sweep on an image.
+
+        Args:
+            image (PIL.Image): The source image
+
+        Returns:
+            list: One dict per combination with the keys "pixel_size",
+                "color_count", "dither_method", "palette_name" and "image",
+                where "image" is the quantized image before upscaling
+
+        Raises:
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+
+        # Decode once up front; lazy loading is not safe across threads
+        image.load()
+        combinations = self.combinations()
+
+        # Collapse combinations that produce the same result
+        keys = [self._result_key(*combo) for combo in combinations]
+        unique_keys = list(dict.fromkeys(keys))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            smalls = dict(zip(
+                self.pixel_sizes,
+                executor.map(lambda size: ImageProcessor.downsample(image, size), self.pixel_sizes)
+            ))
+            quantized = dict(zip(
+                unique_keys,
+                executor.map(
+                    lambda key: ImageProcessor.reduce_colors(smalls[key[0]], key[1], key[2], key[3]),
+                    unique_keys
+                )
+            ))
+
+        results = []
+        for (pixel_size, color_count, dither_method, palette_name), key in zip(combinations, keys):
+            results.append({
+                "pixel_size": pixel_size,
+                "color_count": color_count,
+                "dither_method": dither_method,
+                "palette_name": palette_name,
+                "image": quantized[key],
+            })
+        return results
+
+    @staticmethod
+    def _result_key(pixel_size, color_count, dither_method, palette_name):
+        """Key that is equal for combinations with identical output"""
+        if palette_name:
+            # A fixed palette is always mapped as a whole
+            color_count = len(ImageProcessor.PALETTES[palette_name])
+        return (pixel_size, color_count, dither_method, palette_name)
+
+    @staticmethod
+    def label(result):
+        """
+        Describe the settings of a sweep result.
+
+        Args:
+            result (dict): A result returned by run()
+
+        Returns:
+            str: Short human readable label
+        """
+        color_count = result["color_count"]
+        if color_count == "auto":
+            color_count = f"auto={len(result['image'].getcolors())}"
+        parts = [f"{result['pixel_size']}px", f"{color_count}c"]
+        if result["dither_method"] != "none":
+            parts.append(result["dither_method"])
+        parts.append(result["palette_name"] or "adaptive")
+        return " ".join(parts)
+
+    @staticmethod
+    def contact_sheet(results, cell_size=160, columns=None):
+        """
+        Lay out sweep results in a labeled grid.
+
+        Args:
+            results (list): Results returned by run()
+            cell_size (int): Width and height of each preview cell (default: 160)
+            columns (int): Number of columns (default: None for a square-ish grid)
+
+        Returns:
+            PIL.Image: The contact sheet
+
+        Raises:
+            ValueError: If results is empty or cell_size is invalid
+        """
+        if not results:
+            raise ValueError("No results to lay out")
+
+        if not isinstance(cell_size, int) or cell_size <= 0:
+            raise ValueError("Cell size must be a positive integer")
+
+        columns = columns or math.ceil(math.sqrt(len(results)))
+        rows = math.ceil(len(results) / columns)
+        label_height = 14
+        pad = 4
+        cell_w = cell_size + pad * 2
+        cell_h = cell_size + label_height + pad * 2
+
+        sheet = Image.new("RGB", (columns * cell_w, rows * cell_h), color=(46, 46, 46))
+        draw = ImageDraw.Draw(sheet)
+
+        for i, result in enumerate(results):
+            col, row = i % columns, i // columns
+            x0, y0 = col * cell_w + pad, row * cell_h + pad
+
+            # Use the block grid directly so every cell is an exact integer scale
+            preview = ImageProcessor.resize_nearest_integer(result["image"], (cell_size, cell_size))
+            sheet.paste(
+                preview.convert("RGB"),
+                (x0 + (cell_size - preview.width) // 2, y0 + (cell_size - preview.height) // 2)
+            )
+            draw.text((x0, y0 + cell_size + 1), ParameterSweep.label(result), fill=(224, 224, 224))
+
+        return sheet
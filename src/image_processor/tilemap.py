@@ -0,0 +1,213 @@
+"""
+Tileset and tilemap export for tile-based games.
+"""
+import json
+import math
+from pathlib import Path
+
+from PIL import Image
+import numpy as np
+
+from .processor import ImageProcessor
+
+class TilemapExporter:
+    """
+    Split pixel art into unique tiles and a map of tile indices.
+
+    Works on the block grid returned by ImageProcessor.reduce_colors (one
+    pixel per output block), so tiles of tile_size blocks are always aligned
+    to the pixel_size grid of the final image. All tile-grid cells are cut out
+    with a single reshape and hashed together as rows of 64-bit words; equal
+    hashes are then checked against the actual pixels, so a hash collision can
+    never merge two different tiles. With match_flips, each cell is keyed by
+    the smallest hash of its four flipped versions, so mirrored tiles share one
+    tileset entry and the map records which flip to apply.
+    """
+
+    # Bits of a flip code: the tileset tile is mirrored left-right and/or top-bottom
+    FLIP_HORIZONTAL = 1
+    FLIP_VERTICAL = 2
+
+    # Modes whose pixels map directly onto uint8 arrays
+    SUPPORTED_MODES = ("P", "L", "RGB", "RGBA")
+
+    def __init__(self, tile_size=8, match_flips=False):
+        """
+        Initialize the exporter.
+
+        Args:
+            tile_size (int): Width and height of a tile in blocks (default: 8)
+            match_flips (bool): Treat mirrored tiles as duplicates (default: False)
+
+        Raises:
+            ValueError: If tile_size is invalid
+        """
+        if not isinstance(tile_size, int) or tile_size <= 0:
+            raise ValueError("Tile size must be a positive integer")
+
+        self.tile_size = tile_size
+        self.match_flips = match_flips
+
+    def _cells(self, image):
+        """Cut an image into an (n, tile, tile[, channels]) array of tile-grid cells"""
+        pixels = np.asarray(image)
+        t = self.tile_size
+        rows = -(-pixels.shape[0] // t)
+        cols = -(-pixels.shape[1] // t)
+
+        # Partial tiles at the right and bottom edges are padded with zeros
+        padding = [(0, rows * t - pixels.shape[0]), (0, cols * t - pixels.shape[1])]
+        if padding[0][1] or padding[1][1]:
+            pixels = np.pad(pixels, padding + [(0, 0)] * (pixels.ndim - 2))
+
+        channels = pixels.shape[2:]
+        cells = pixels.reshape(rows, t, cols, t, *channels).swapaxes(1, 2).reshape(rows * cols, t, t, *channels)
+        return np.ascontiguousarray(cells), rows, cols
+
+    @staticmethod
+    def _hash(cells):
+        """Hash every cell at once to a uint64"""
+        flat = cells.reshape(len(cells), -1)
+        # View each cell as 64-bit words, zero-padding the last word
+        flat = np.pad(flat, ((0, 0), (0, -flat.shape[1] % 8)))
+        words = flat.view(np.uint64)
+
+        # Fixed odd multipliers, so a difference in any single word always changes the hash
+        multipliers = np.random.default_rng(0x7113).integers(0, 1 << 63, words.shape[1], dtype=np.uint64)
+        multipliers = multipliers * np.uint64(2) + np.uint64(1)
+        return (words * multipliers).sum(axis=1, dtype=np.uint64)
+
+    @staticmethod
+    def _group(keys):
+        """Number equal keys in order of first appearance; returns (first cell of each tile, tile per cell)"""
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return first[order], rank[inverse.ravel()]
+
+    def build(self, image):
+        """
+        Find the unique tiles of an image and map every cell to one of them.
+
+        Args:
+            image (PIL.Image): The block grid of a converted image, usually a 'P' image
+
+        Returns:
+            tuple: (tiles, tilemap, flips) where tiles is a uint8 array of
+                shape (count, tile_size, tile_size[, channels]), tilemap is an
+                int32 array of tile indices with one entry per tile-grid cell,
+                and flips is a uint8 array of the same shape holding flip codes
+                (all zero unless match_flips is set)
+
+        Raises:
+            TypeError: If image is not a PIL Image
+        """
+        if not isinstance(image, Image.Image):
+            raise TypeError("Expected a PIL Image object")
+
+        if image.mode not in self.SUPPORTED_MODES:
+            image = image.convert("RGBA" if ImageProcessor.has_alpha(image) else "RGB")
+
+        cells, rows, cols = self._cells(image)
+        flips = np.zeros(len(cells), dtype=np.uint8)
+
+        if self.match_flips:
+            variants = [cells, cells[:, :, ::-1], cells[:, ::-1], cells[:, ::-1, ::-1]]
+            hashes = np.stack([self._hash(np.ascontiguousarray(variant)) for variant in variants], axis=1)
+            # Store each cell in the orientation with the smallest hash
+            flips = hashes.argmin(axis=1).astype(np.uint8)
+            keys = hashes[np.arange(len(cells)), flips]
+            canonical = cells.copy()
+            for code in (1, 2, 3):
+                flipped = flips == code
+                canonical[flipped] = variants[code][flipped]
+        else:
+            keys = self._hash(cells)
+            canonical = cells
+
+        first, tile_ids = self._group(keys)
+        tiles = canonical[first]
+
+        if not np.array_equal(tiles[tile_ids], canonical):
+            # Hash collision: group by the raw bytes instead
+            raw = canonical.reshape(len(canonical), -1)
+            first, tile_ids = self._group(raw.view(np.dtype((np.void, raw.shape[1]))).ravel())
+            tiles = canonical[first]
+
+        return tiles, tile_ids.astype(np.int32).reshape(rows, cols), flips.reshape(rows, cols)
+
+    @staticmethod
+    def tileset_image(tiles, source, columns=None, pixel_size=1):
+        """
+        Lay out tiles in a grid image.
+
+        Args:
+            tiles (numpy.ndarray): Tiles returned by build()
+            source (PIL.Image): The image the tiles came from, for its mode and palette
+            columns (int): Tiles per row (default: None for a roughly square tileset)
+            pixel_size (int): Upscale factor of the written tileset (default: 1)
+
+        Returns:
+            PIL.Image: The tileset image
+        """
+        count, tile_size = len(tiles), tiles.shape[1]
+        columns = columns or max(1, math.ceil(math.sqrt(count)))
+        rows = -(-count // columns)
+
+        grid = np.zeros((rows * columns,) + tiles.shape[1:], dtype=np.uint8)
+        grid[:count] = tiles
+        channels = tiles.shape[3:]
+        sheet = grid.reshape(rows, columns, tile_size, tile_size, *channels).swapaxes(1, 2)
+        sheet = sheet.reshape(rows * tile_size, columns * tile_size, *channels)
+
+        mode = source.mode if source.mode in TilemapExporter.SUPPORTED_MODES else (
+            "RGBA" if sheet.ndim == 3 and sheet.shape[2] == 4 else "RGB")
+        tileset = Image.fromarray(sheet, mode)
+        if mode == "P":
+            tileset.putpalette(source.getpalette())
+            if "transparency" in source.info:
+                tileset.info["transparency"] = source.info["transparency"]
+
+        if pixel_size > 1:
+            return ImageProcessor.upscale(tileset, pixel_size)
+        return tileset
+
+    def export(self, image, output_dir, basename="tilemap", pixel_size=1, columns=None):
+        """
+        Write a tileset image and a JSON tilemap.
+
+        The JSON holds the tileset file name, the tile size in output pixels,
+        the map size in tiles, and the row-major "map" of tile indices. With
+        match_flips it also holds "flips", the flip code of every cell.
+
+        Args:
+            image (PIL.Image): The block grid of a converted image
+            output_dir (str or Path): Directory to write into
+            basename (str): Prefix for the written files (default: "tilemap")
+            pixel_size (int): Upscale factor of the written tileset (default: 1)
+            columns (int): Tiles per row of the tileset (default: None for a roughly square tileset)
+
+        Returns:
+            Path: Path of the written JSON tilemap
+        """
+        tiles, tilemap, flips = self.build(image)
+        output_dir = Path(output_dir)
+        tileset_name = f"{basename}_tiles.png"
+        self.tileset_image(tiles, image, columns, pixel_size).save(output_dir / tileset_name)
+
+        data = {
+            "tileset": tileset_name,
+            "tile_size": self.tile_size * pixel_size,
+            "tile_count": len(tiles),
+            "width": tilemap.shape[1],
+            "height": tilemap.shape[0],
+            "map": tilemap.ravel().tolist(),
+        }
+        if self.match_flips:
+            data["flips"] = flips.ravel().tolist()
+
+        map_path = output_dir / f"{basename}.json"
+        with open(map_path, "w") as f:
+            json.dump(data, f)
+        return map_path
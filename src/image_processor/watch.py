@@ -0,0 +1,224 @@
+"""
+Watch a folder and convert new or modified images as they arrive.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import os
+import threading
+import time
+
+from .batch import BatchProcessor
+
+class FolderWatcher:
+    """
+    Long-running watcher that feeds a persistent worker pool.
+
+    The input folder is polled with os.scandir, which only stats directory
+    entries. A file is queued once its size and modification time have stayed
+    the same for settle_time seconds and across two polls, so files that are
+    still being written are left alone. Files whose output already exists and
+    is newer are skipped, so a restarted watcher does not redo finished work.
+    An error during a poll is counted and the next poll runs as usual. Workers
+    share one BatchProcessor, so settings, cached palettes and the memory
+    budget are reused for every file.
+    """
+
+    def __init__(self, input_dir, output_dir, processor, interval=1.0, settle_time=2.0, max_workers=None):
+        """
+        Initialize the watcher.
+
+        Args:
+            input_dir (str or Path): Folder to watch
+            output_dir (str or Path): Folder to write results into
+            processor (BatchProcessor): Conversion settings shared by all jobs
+            interval (float): Seconds between polls (default: 1.0)
+            settle_time (float): Seconds a file must stay unchanged before it is queued (default: 2.0)
+            max_workers (int): Number of worker threads (default: None for the processor's worker count)
+
+        Raises:
+            ValueError: If the folders or timings are invalid
+        """
+        self.input_dir = Path(input_dir)
+        self.output_dir = Path(output_dir)
+        if not self.input_dir.is_dir():
+            raise ValueError(f"Input folder does not exist: {input_dir}")
+        if self.input_dir.resolve() == self.output_dir.resolve():
+            raise ValueError("Input and output folders must be different")
+        if interval <= 0 or settle_time < 0:
+            raise ValueError("Interval must be positive and settle time non-negative")
+
+        self.processor = processor
+        self.interval = interval
+        self.settle_time = settle_time
+        self.max_workers = max_workers or processor.max_workers
+
+        # path -> signature of the version last queued
+        self._queued = {}
+        # path -> (signature, first time this signature was seen)
+        self._candidates = {}
+
+        self._executor = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._processed = 0
+        self._errors = []
+        self._poll_errors = 0
+        self._last_poll_error = None
+        self._latencies = deque(maxlen=1000)
+
+    def _scan(self):
+        """Return {path: (size, mtime_ns)} for image files in the input folder"""
+        signatures = {}
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file() or Path(entry.name).suffix.lower() not in BatchProcessor.IMAGE_EXTENSIONS:
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Removed between listing and stat
+                    continue
+                signatures[Path(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def poll_once(self):
+        """
+        Scan the folder once and queue files whose writes have finished.
+
+        Returns:
+            list: Paths queued by this poll
+        """
+        now = time.monotonic()
+        queued = []
+        signatures = self._scan()
+
+        # Forget files that were removed
+        for known in (self._queued, self._candidates):
+            for path in [path for path in known if path not in signatures]:
+                del known[path]
+
+        for path, signature in signatures.items():
+            if self._queued.get(path) == signature:
+                continue
+
+            if path not in self._queued and path not in self._candidates and self._is_converted(path, signature):
+                # Converted by an earlier run
+                self._queued[path] = signature
+                continue
+
+            seen = self._candidates.get(path)
+            if seen is None or seen[0] != signature:
+                # New or still changing: (re)start the settle timer
+                self._candidates[path] = (signature, now)
+                continue
+
+            if now - seen[1] >= self.settle_time:
+                del self._candidates[path]
+                self._queued[path] = signature
+                self._submit(path, seen[1])
+                queued.append(path)
+
+        return queued
+
+    def _is_converted(self, path, signature):
+        """Whether the output of a file exists and is newer than the file"""
+        try:
+            return self.processor.output_path(path, self.output_dir).stat().st_mtime_ns >= signature[1]
+        except FileNotFoundError:
+            return False
+
+    def _submit(self, path, detected_at):
+        """Hand a file to the worker pool"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        with self._lock:
+            self._queue_depth += 1
+        self._executor.submit(self._convert, path, detected_at)
+
+    def _convert(self, path, detected_at):
+        """Worker: convert one file and record its end-to-end latency"""
+        try:
+            self.processor.process_file(path, self.output_dir)
+            with self._lock:
+                self._processed += 1
+                self._latencies.append(time.monotonic() - detected_at)
+        except Exception as e:
+            with self._lock:
+                self._errors.append((path.name, str(e)))
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+
+    def stats(self):
+        """
+        Current watcher statistics.
+
+        Returns:
+            dict: "queue_depth" (files queued or converting), "processed",
+                "errors" (a list of (file name, message) tuples),
+                "poll_errors" and "last_poll_error" for failed folder scans, and
+                "last_latency", "mean_latency" and "max_latency" in seconds
+                from first detection to written output (None before the
+                first result)
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "queue_depth": self._queue_depth,
+                "processed": self._processed,
+                "errors": list(self._errors),
+                "poll_errors": self._poll_errors,
+                "last_poll_error": self._last_poll_error,
+                "last_latency": latencies[-1] if latencies else None,
+                "mean_latency": sum(latencies) / len(latencies) if latencies else None,
+                "max_latency": max(latencies) if latencies else None,
+            }
+
+    def run(self, on_poll=None):
+        """
+        Poll until stop() is called.
+
+        Args:
+            on_poll (callable): Called as on_poll(stats) after each poll (default: None)
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        while not self._stop.is_set():
+            # A vanished share or a failing callback must not end the watcher thread
+            try:
+                self.poll_once()
+                if on_poll:
+                    on_poll(self.stats())
+            except Exception as e:
+                with self._lock:
+                    self._poll_errors += 1
+                    self._last_poll_error = str(e)
+            self._stop.wait(self.interval)
+
+    def start(self, on_poll=None):
+        """
+        Run the watcher on a background thread.
+
+        Args:
+            on_poll (callable): Called as on_poll(stats) after each poll (default: None)
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, args=(on_poll,), daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        """
+        Stop polling and shut down the worker pool.
+
+        Args:
+            wait (bool): Wait for queued files to finish (default: True)
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -8,7 +8,11 @@ from PIL import Image, ImageTk
 # Add parent directory to path to make imports work
 sys.path.append(str(Path(__file__).parent.parent))
 from image_processor.processor import ImageProcessor
+from image_processor.batch import BatchProcessor
+from image_processor.pyramid import ResolutionPyramid
+from image_processor.plan import ConversionPlan
 from ui.dark_messagebox import patch_messagebox
+from ui.history import ImageHistory
 
 class AppWindow:
     def __init__(self, root):
@@ -32,10 +36,23 @@ class AppWindow:
         
         # Image variables
         self.original_image = None
+        # Block grid of the current result; upscaled to full size only when saved
         self.processed_image = None
+        self.pyramid = None
+        # Compiled settings of the last conversion, reused until they change
+        self.plan = None
+        self.plan_settings = None
+        
+        # Undo/redo states of the processed image, kept before upscaling
+        self.history = ImageHistory()
         self.original_photo = None
         self.processed_photo = None
         
+        # Cached display state, reused across redraws
+        self.original_thumbnail = None
+        self.original_item = None
+        self.processed_item = None
+        
         self._setup_ui()
     
     def _set_dark_theme(self):
@@ -149,6 +166,16 @@ class AppWindow:
         # Save button
         self.save_btn = ttk.Button(button_frame, text="Save", command=self._save_image)
         self.save_btn.pack(side=tk.LEFT, padx=2, pady=0)
+        
+        # Undo/redo buttons
+        self.undo_btn = ttk.Button(button_frame, text="Undo", command=self._undo)
+        self.undo_btn.pack(side=tk.LEFT, padx=2, pady=0)
+        self.redo_btn = ttk.Button(button_frame, text="Redo", command=self._redo)
+        self.redo_btn.pack(side=tk.LEFT, padx=2, pady=0)
+        self._update_history_buttons()
+        
+        self.root.bind("<Control-z>", lambda event: self._undo())
+        self.root.bind("<Control-y>", lambda event: self._redo())
     
     def _setup_advanced_controls(self):
         """Setup advanced control options"""
@@ -193,9 +220,9 @@ class AppWindow:
         ttk.Label(filter_frame, text="Filter:").grid(row=0, column=0, padx=2, pady=0)
         self.filter_type = tk.StringVar(value="none")
         filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_type, width=15)
-        filter_combo['values'] = ["none", "grayscale", "sepia", "invert"]
+        # Editable so that chains like "grayscale,contrast:1.2" can be typed
+        filter_combo['values'] = ["none", "grayscale", "sepia", "invert", "grayscale,contrast:1.2", "gamma:1.5"]
         filter_combo.grid(row=0, column=1, padx=2, pady=0)
-        filter_combo.state(['readonly'])
         
         # Apply filter button
         self.apply_filter_btn = ttk.Button(filter_frame, text="Apply Filter", command=self._apply_filter)
@@ -206,7 +233,12 @@ class AppWindow:
         batch_frame.pack(side=tk.LEFT, padx=2, pady=1, fill=tk.X, expand=True)
         
         self.batch_btn = ttk.Button(batch_frame, text="Process Folder", command=self._batch_process)
-        self.batch_btn.pack(padx=2, pady=0)
+        self.batch_btn.pack(side=tk.LEFT, padx=2, pady=0)
+        
+        # Pack batch outputs into atlas textures instead of separate files
+        self.atlas_mode = tk.BooleanVar(value=False)
+        atlas_check = ttk.Checkbutton(batch_frame, text="Pack into atlas", variable=self.atlas_mode)
+        atlas_check.pack(side=tk.LEFT, padx=2, pady=0)
     
     def _setup_image_area(self):
         """Setup the image display area"""
@@ -251,6 +283,15 @@ class AppWindow:
         if file_path:
             try:
                 self.original_image = Image.open(file_path)
+                self.original_thumbnail = None
+                
+                # Build downsampled levels in the background for fast pixel size changes
+                if self.pyramid is not None:
+                    self.pyramid.cancel()
+                self.pyramid = ResolutionPyramid(self.original_image)
+                self.processed_image = None
+                self.history.clear()
+                self._update_history_buttons()
                 self._display_images(self.original_image, None)
                 self.status_var.set(f"Loaded image: {os.path.basename(file_path)}")
             except Exception as e:
@@ -268,9 +309,7 @@ class AppWindow:
             if pixel_size <= 0:
                 raise ValueError("Pixel size must be positive")
                 
-            color_count = int(self.color_count.get())
-            if color_count <= 0 or color_count > 256:
-                raise ValueError("Color count must be between 1 and 256")
+            color_count = self._get_color_count()
             
             # Get advanced settings
             dither_method = self.dither_method.get()
@@ -280,28 +319,42 @@ class AppWindow:
             self.status_var.set("Processing image...")
             self.root.update()
             
-            # Process the image
-            self.processed_image = ImageProcessor.convert_to_pixel_art(
-                self.original_image,
-                pixel_size,
-                color_count,
-                dither_method,
-                palette_name
-            )
+            plan = self._get_plan(pixel_size, color_count, dither_method, palette_name, self.filter_type.get())
             
-            # Apply filter if selected
-            if self.filter_type.get() != "none":
-                self.processed_image = self._apply_filter_to_image(self.processed_image)
+            # Process the image, keeping the filtered block grid for the history
+            small = plan.quantize(self.pyramid.downsample(pixel_size))
             
             # Display the result
-            self._display_images(self.original_image, self.processed_image)
-            self.status_var.set("Conversion complete")
+            self.history.push(small, pixel_size, "Convert")
+            self._show_history_state()
+            if color_count == "auto":
+                self.status_var.set(f"Conversion complete, auto picked {len(small.getcolors())} colors")
+            else:
+                self.status_var.set("Conversion complete")
             
         except ValueError as e:
             messagebox.showerror("Invalid Input", str(e) or "Please enter valid numbers for Pixel Size and Color Count.")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
+    def _get_plan(self, *settings):
+        """Return a conversion plan for the settings, compiling a new one only when they change"""
+        if self.plan is None or self.plan_settings != settings:
+            self.plan = ConversionPlan(*settings)
+            self.plan_settings = settings
+        return self.plan
+    
+    def _get_color_count(self):
+        """Read the Color Count setting, which is a number or auto"""
+        value = self.color_count.get().strip().lower()
+        if value == "auto":
+            return "auto"
+        
+        color_count = int(value)
+        if color_count <= 0 or color_count > 256:
+            raise ValueError("Color count must be between 1 and 256, or \"auto\"")
+        return color_count
+    
     def _apply_filter(self):
         """Apply selected filter to the processed image"""
         if self.processed_image is None:
@@ -309,8 +362,13 @@ class AppWindow:
             return
         
         try:
-            self.processed_image = self._apply_filter_to_image(self.processed_image)
-            self._display_images(self.original_image, self.processed_image)
+            # Filters map colors, so the block grid is filtered directly
+            state = self.history.current
+            filtered = self._apply_filter_to_image(state["image"])
+            if filtered is state["image"]:
+                return
+            self.history.push(filtered, state["pixel_size"], f"{self.filter_type.get()} filter")
+            self._show_history_state()
             self.status_var.set(f"Applied {self.filter_type.get()} filter")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to apply filter: {str(e)}")
@@ -323,6 +381,33 @@ class AppWindow:
         
         return ImageProcessor.apply_filter(image, filter_type)
     
+    def _show_history_state(self):
+        """Display the current history state as the processed image"""
+        state = self.history.current
+        # The preview is scaled straight from the block grid
+        self.processed_image = None if state is None else state["image"]
+        self._display_images(self.original_image, self.processed_image)
+        self._update_history_buttons()
+    
+    def _update_history_buttons(self):
+        """Enable undo/redo buttons only when there is a state to go to"""
+        self.undo_btn.state(['!disabled'] if self.history.can_undo else ['disabled'])
+        self.redo_btn.state(['!disabled'] if self.history.can_redo else ['disabled'])
+    
+    def _undo(self):
+        """Go back to the previous processed image"""
+        state = self.history.current
+        if self.history.undo() is not None:
+            self._show_history_state()
+            self.status_var.set(f"Undid {state['label']}")
+    
+    def _redo(self):
+        """Go forward to the next processed image"""
+        state = self.history.redo()
+        if state is not None:
+            self._show_history_state()
+            self.status_var.set(f"Redid {state['label']}")
+    
     def _batch_process(self):
         """Process multiple images in a folder"""
         input_dir = filedialog.askdirectory(title="Select Input Folder")
@@ -335,51 +420,38 @@ class AppWindow:
         
         try:
             # Get settings
-            pixel_size = int(self.pixel_size.get())
-            color_count = int(self.color_count.get())
-            dither_method = self.dither_method.get()
-            palette_name = self.palette_name.get() or None
-            filter_type = self.filter_type.get()
+            processor = BatchProcessor(
+                int(self.pixel_size.get()),
+                self._get_color_count(),
+                self.dither_method.get(),
+                self.palette_name.get() or None,
+                self.filter_type.get()
+            )
             
             # Find all image files
-            image_files = []
-            for ext in ['.png', '.jpg', '.jpeg', '.bmp', '.gif']:
-                image_files.extend(list(Path(input_dir).glob(f"*{ext}")))
-                image_files.extend(list(Path(input_dir).glob(f"*{ext.upper()}")))
+            image_files = BatchProcessor.find_images(input_dir)
             
             if not image_files:
                 messagebox.showinfo("No Images", "No image files found in the selected folder.")
                 return
             
-            # Process each image
-            processed_count = 0
-            for img_path in image_files:
-                try:
-                    # Update status
-                    self.status_var.set(f"Processing {img_path.name}...")
-                    self.root.update()
-                    
-                    # Open and process image
-                    img = Image.open(img_path)
-                    processed = ImageProcessor.convert_to_pixel_art(
-                        img, pixel_size, color_count, dither_method, palette_name
-                    )
-                    
-                    # Apply filter if selected
-                    if filter_type != "none":
-                        processed = ImageProcessor.apply_filter(processed, filter_type)
-                    
-                    # Save the processed image
-                    output_path = Path(output_dir) / f"pixel_{img_path.name}"
-                    processed.save(output_path)
-                    processed_count += 1
-                    
-                except Exception as e:
-                    print(f"Error processing {img_path.name}: {e}")
+            def report(done, total, img_path):
+                self.status_var.set(f"Processed {done}/{total}: {img_path.name}")
+                self.root.update()
+            
+            # Process images in parallel within the memory budget
+            summary = processor.run(image_files, output_dir, self.atlas_mode.get(), report)
+            for name, error in summary["errors"]:
+                print(f"Error processing {name}: {error}")
             
             # Show completion message
+            processed_count = summary["processed"] + summary["duplicates"]
+            message = f"Successfully processed {processed_count} out of {len(image_files)} images."
+            if summary["duplicates"]:
+                message += (f"\n{summary['duplicates']} duplicates reused an existing result, "
+                            f"skipping {summary['saved_pixels'] / 1e6:.1f} megapixels of work.")
             self.status_var.set(f"Batch processing complete. Processed {processed_count} images.")
-            messagebox.showinfo("Batch Complete", f"Successfully processed {processed_count} out of {len(image_files)} images.")
+            messagebox.showinfo("Batch Complete", message)
             
         except ValueError as e:
             messagebox.showerror("Invalid Input", str(e))
@@ -398,7 +470,8 @@ class AppWindow:
         )
         if file_path:
             try:
-                self.processed_image.save(file_path)
+                state = self.history.current
+                ImageProcessor.upscale(state["image"], state["pixel_size"]).save(file_path)
                 self.status_var.set(f"Image saved to {os.path.basename(file_path)}")
                 messagebox.showinfo("Success", f"Image saved to {file_path}")
             except Exception as e:
@@ -407,33 +480,45 @@ class AppWindow:
     def _display_images(self, original, processed):
         """Display both original and processed images"""
         display_size = (400, 400)
-        bg_color = "#2e2e2e"  # Dark background
-        
-        # Clear canvases
-        self.original_canvas.delete("all")
-        self.processed_canvas.delete("all")
         
         if original:
-            original_resized = ImageProcessor.resize_with_aspect_ratio(original, display_size)
-            self.original_photo = ImageTk.PhotoImage(original_resized)
-            
-            # Calculate center position
-            x = (400 - original_resized.width) // 2
-            y = (400 - original_resized.height) // 2
-            
-            # Create image on canvas with dark background
-            self.original_canvas.create_image(x, y, anchor=tk.NW, image=self.original_photo)
+            # The original thumbnail only changes when a new image is loaded
+            if self.original_thumbnail is None:
+                self.original_thumbnail = ImageProcessor.resize_with_aspect_ratio(original, display_size)
+                self.original_photo, self.original_item = self._show_on_canvas(
+                    self.original_canvas, self.original_thumbnail, self.original_photo, self.original_item
+                )
             
             # Show image dimensions in status bar
             self.status_var.set(f"Image dimensions: {original.width}x{original.height}")
         
         if processed:
-            processed_resized = ImageProcessor.resize_with_aspect_ratio(processed, display_size)
-            self.processed_photo = ImageTk.PhotoImage(processed_resized)
-            
-            # Calculate center position
-            x = (400 - processed_resized.width) // 2
-            y = (400 - processed_resized.height) // 2
-            
-            # Create image on canvas with dark background
-            self.processed_canvas.create_image(x, y, anchor=tk.NW, image=self.processed_photo) 
\ No newline at end of file
+            processed_resized = ImageProcessor.resize_nearest_integer(processed, display_size)
+            self.processed_photo, self.processed_item = self._show_on_canvas(
+                self.processed_canvas, processed_resized, self.processed_photo, self.processed_item
+            )
+        elif self.processed_item is not None:
+            self.processed_canvas.delete(self.processed_item)
+            self.processed_photo = None
+            self.processed_item = None
+    
+    def _show_on_canvas(self, canvas, image, photo, item):
+        """Show image centered on canvas, reusing the existing PhotoImage when the size matches"""
+        if photo is not None and (photo.width(), photo.height()) == image.size:
+            # Update pixels in place instead of allocating a new Tk image
+            photo.paste(image)
+        else:
+            photo = ImageTk.PhotoImage(image)
+            if item is not None:
+                canvas.itemconfigure(item, image=photo)
+        
+        # Calculate center position
+        x = (400 - image.width) // 2
+        y = (400 - image.height) // 2
+        
+        if item is None:
+            item = canvas.create_image(x, y, anchor=tk.NW, image=photo)
+        else:
+            canvas.coords(item, x, y)
+        
+        return photo, item
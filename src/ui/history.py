@@ -0,0 +1,118 @@
+"""
+Undo/redo history of processed images.
+"""
+
+class ImageHistory:
+    """
+    Memory-bounded undo/redo history.
+
+    Each state keeps the image before upscaling (usually a small 'P' image)
+    and its pixel size, so stepping through the history only needs a NEAREST
+    upscale. When the stored states exceed the memory cap, the oldest undo
+    states are evicted first; the current state is always kept.
+    """
+
+    # Default memory cap for stored states: 64 MiB
+    DEFAULT_MAX_BYTES = 64 << 20
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the history.
+
+        Args:
+            max_bytes (int): Memory cap for stored states (default: 64 MiB)
+
+        Raises:
+            ValueError: If max_bytes is invalid
+        """
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("Memory cap must be a positive integer")
+
+        self.max_bytes = max_bytes
+        self._undo = []
+        self._redo = []
+        self._current = None
+        self.memory_used = 0
+
+    @staticmethod
+    def _size_of(entry):
+        """Approximate bytes held by a state"""
+        image = entry["image"]
+        # Pillow keeps 1 byte per pixel for 'L'/'P' and 4 for other 8-bit modes
+        bytes_per_pixel = 1 if image.mode in ("1", "L", "P") else 4
+        return image.width * image.height * bytes_per_pixel + (768 if image.mode == "P" else 0)
+
+    @property
+    def current(self):
+        """The current state, a dict with "image", "pixel_size" and "label", or None"""
+        return self._current
+
+    @property
+    def can_undo(self):
+        """Whether there is a state to go back to"""
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        """Whether there is a state to go forward to"""
+        return bool(self._redo)
+
+    def push(self, image, pixel_size, label):
+        """
+        Record a new current state and drop the redo states.
+
+        Args:
+            image (PIL.Image): The image before upscaling
+            pixel_size (int): Upscale factor for display and saving
+            label (str): Short description of the step
+        """
+        for entry in self._redo:
+            self.memory_used -= self._size_of(entry)
+        self._redo.clear()
+
+        if self._current is not None:
+            self._undo.append(self._current)
+
+        self._current = {"image": image, "pixel_size": pixel_size, "label": label}
+        self.memory_used += self._size_of(self._current)
+        self._evict()
+
+    def _evict(self):
+        """Drop the oldest states until the history fits its memory cap"""
+        while self.memory_used > self.max_bytes and (self._undo or self._redo):
+            # Prefer discarding the far past over the redo states
+            entry = self._undo.pop(0) if self._undo else self._redo.pop(0)
+            self.memory_used -= self._size_of(entry)
+
+    def undo(self):
+        """
+        Step back one state.
+
+        Returns:
+            dict: The new current state, or None if there is nothing to undo
+        """
+        if not self._undo:
+            return None
+        self._redo.append(self._current)
+        self._current = self._undo.pop()
+        return self._current
+
+    def redo(self):
+        """
+        Step forward one state.
+
+        Returns:
+            dict: The new current state, or None if there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        self._undo.append(self._current)
+        self._current = self._redo.pop()
+        return self._current
+
+    def clear(self):
+        """Forget all states"""
+        self._undo.clear()
+        self._redo.clear()
+        self._current = None
+        self.memory_used = 0
@@ -0,0 +1,7 @@
+"""
+Argument parsers shared by the command line scripts
+"""
+
+def color_count_arg(value):
+    """Parse a color count, which is a number or auto"""
+    return value if value == "auto" else int(value)
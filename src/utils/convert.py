@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Convert a single image to pixel art, optionally using several threads
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.plan import ConversionPlan
+from src.image_processor.parallel import TileParallelConverter
+from src.utils.cli_args import color_count_arg
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Convert one image to pixel art.")
+    parser.add_argument("input", help="Source image")
+    parser.add_argument("output", help="Path of the pixel art image to write")
+    parser.add_argument("--pixel-size", type=int, default=8)
+    parser.add_argument("--color-count", type=color_count_arg, default=32,
+                        help='Number of colors, or "auto" for the fewest that keep good quality')
+    parser.add_argument("--dither", default="none", choices=list(ImageProcessor.DITHER_METHODS.keys()))
+    parser.add_argument("--palette", default=None, choices=list(ImageProcessor.PALETTES.keys()))
+    parser.add_argument("--filter", default="none",
+                        help='Filter or comma-separated chain, e.g. "grayscale,contrast:1.3"')
+    parser.add_argument("--threads", type=int, default=1,
+                        help="Convert bands of the image on this many threads, for very large images")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Also time the single-threaded and the threaded conversion and print the speedup")
+    return parser.parse_args(argv)
+
+def best_time(convert, image, repeats=3):
+    """Fastest of several runs of convert(image), in seconds"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        convert(image)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main(argv=None):
+    """Convert the image and write the result"""
+    args = parse_args(argv)
+
+    try:
+        if args.threads <= 0:
+            raise ValueError("Thread count must be a positive integer")
+        plan = ConversionPlan(args.pixel_size, args.color_count, args.dither, args.palette, args.filter)
+        converter = TileParallelConverter(max_workers=args.threads)
+        settings = (args.pixel_size, args.color_count, args.dither, args.palette, plan.filter_chain)
+
+        image = Image.open(args.input)
+        image.load()
+        if args.threads > 1:
+            result = converter.convert(image, *settings)
+        else:
+            result = plan.convert(image)
+        result.save(args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.benchmark:
+        serial = best_time(plan.convert, image)
+        threaded = best_time(lambda source: converter.convert(source, *settings), image)
+        print(f"1 thread: {serial:.3f}s  {args.threads} threads: {threaded:.3f}s  speedup: {serial / threaded:.2f}x")
+
+    print(f"Wrote {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
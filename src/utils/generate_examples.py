@@ -10,6 +10,7 @@ from PIL import Image, ImageDraw
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.image_processor.processor import ImageProcessor
+from src.image_processor.sweep import ParameterSweep
 
 def create_directory(path):
     """Create directory if it doesn't exist"""
@@ -63,17 +64,16 @@ def main():
     geometric_path = assets_dir / "geometric.png"
     geometric.save(geometric_path)
     
-    # Create pixel art versions with different settings
+    # Create pixel art versions with different pixel sizes and color counts
+    sweep = ParameterSweep([4, 8, 16], [8, 16, 32])
     for img_path, name in [(gradient_path, "gradient"), (geometric_path, "geometric")]:
         img = Image.open(img_path)
         
-        # Different pixel sizes
-        for pixel_size in [4, 8, 16]:
-            # Different color counts
-            for color_count in [8, 16, 32]:
-                pixel_art = ImageProcessor.convert_to_pixel_art(img, pixel_size, color_count)
-                output_path = assets_dir / f"{name}_pixel_{pixel_size}px_{color_count}colors.png"
-                pixel_art.save(output_path)
+        for result in sweep.run(img):
+            pixel_size, color_count = result["pixel_size"], result["color_count"]
+            pixel_art = ImageProcessor.upscale(result["image"], pixel_size)
+            output_path = assets_dir / f"{name}_pixel_{pixel_size}px_{color_count}colors.png"
+            pixel_art.save(output_path)
     
     print(f"Example images generated in {assets_dir}")
 
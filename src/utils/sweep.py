@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Sweep pixel art settings for an image and write a labeled contact sheet
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.sweep import ParameterSweep
+from src.image_processor.filters import FilterChain
+from src.utils.cli_args import color_count_arg
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Try many pixel art settings on one image.")
+    parser.add_argument("input", help="Source image")
+    parser.add_argument("output", help="Path of the contact sheet to write")
+    parser.add_argument("--pixel-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--color-counts", type=color_count_arg, nargs="+", default=[8, 16, 32],
+                        help='Color counts to try; "auto" picks the fewest that keep good quality')
+    parser.add_argument("--dithers", nargs="+", default=["none"],
+                        choices=list(ImageProcessor.DITHER_METHODS.keys()))
+    parser.add_argument("--palettes", nargs="+", default=["adaptive"],
+                        choices=["adaptive"] + list(ImageProcessor.PALETTES.keys()))
+    parser.add_argument("--filters", default="none",
+                        help='Filter or comma-separated chain applied to every result, e.g. "sepia,contrast:1.2"')
+    parser.add_argument("--cell-size", type=int, default=160, help="Preview size of each setting")
+    parser.add_argument("--columns", type=int, default=None, help="Columns in the contact sheet")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker threads")
+    parser.add_argument("--save-all", metavar="DIR", default=None,
+                        help="Also write every full-size result into this directory")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the sweep and write its contact sheet"""
+    args = parse_args(argv)
+    palettes = [None if name == "adaptive" else name for name in args.palettes]
+
+    try:
+        sweep = ParameterSweep(args.pixel_sizes, args.color_counts, args.dithers, palettes, args.workers)
+        chain = FilterChain(args.filters)
+        image = Image.open(args.input)
+        results = sweep.run(image)
+        for result in results:
+            result["image"] = ImageProcessor.apply_filter(result["image"], chain)
+        sheet = ParameterSweep.contact_sheet(results, args.cell_size, args.columns)
+        sheet.save(args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.save_all:
+        os.makedirs(args.save_all, exist_ok=True)
+        stem = Path(args.input).stem
+        for result in results:
+            label = ParameterSweep.label(result).replace(" ", "_")
+            output_path = Path(args.save_all) / f"{stem}_{label}.png"
+            ImageProcessor.upscale(result["image"], result["pixel_size"]).save(output_path)
+
+    print(f"Wrote {len(results)} settings to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
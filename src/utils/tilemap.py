@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Convert an image to pixel art and export it as a tileset and tilemap
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.tilemap import TilemapExporter
+from src.utils.cli_args import color_count_arg
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Export pixel art as unique tiles plus a tilemap.")
+    parser.add_argument("input", help="Source image")
+    parser.add_argument("output", help="Directory to write the tileset and tilemap into")
+    parser.add_argument("--pixel-size", type=int, default=8)
+    parser.add_argument("--color-count", type=color_count_arg, default=32,
+                        help='Number of colors, or "auto" for the fewest that keep good quality')
+    parser.add_argument("--dither", default="none", choices=list(ImageProcessor.DITHER_METHODS.keys()))
+    parser.add_argument("--palette", default=None, choices=list(ImageProcessor.PALETTES.keys()))
+    parser.add_argument("--tile-size", type=int, default=8, help="Tile width and height in pixel art blocks")
+    parser.add_argument("--flips", action="store_true", help="Reuse tiles that are mirrored copies of each other")
+    parser.add_argument("--columns", type=int, default=None, help="Tiles per row of the tileset image")
+    parser.add_argument("--name", default=None, help="Base name of the written files (default: input name)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Convert the image and write its tileset and tilemap"""
+    args = parse_args(argv)
+
+    try:
+        ImageProcessor.validate_settings(args.pixel_size, args.color_count, args.dither, args.palette)
+        exporter = TilemapExporter(args.tile_size, args.flips)
+        image = Image.open(args.input)
+        small = ImageProcessor.downsample(image, args.pixel_size)
+        small = ImageProcessor.reduce_colors(small, args.color_count, args.dither, args.palette)
+
+        os.makedirs(args.output, exist_ok=True)
+        map_path = exporter.export(small, args.output, args.name or Path(args.input).stem,
+                                   args.pixel_size, args.columns)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Wrote {map_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
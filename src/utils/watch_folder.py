@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Watch a folder and convert images to pixel art as they arrive
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.batch import BatchProcessor
+from src.image_processor.watch import FolderWatcher
+from src.utils.cli_args import color_count_arg
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Convert images dropped into a folder to pixel art.")
+    parser.add_argument("input", help="Folder to watch")
+    parser.add_argument("output", help="Folder to write results into")
+    parser.add_argument("--pixel-size", type=int, default=8)
+    parser.add_argument("--color-count", type=color_count_arg, default=32,
+                        help='Number of colors, or "auto" for the fewest that keep good quality')
+    parser.add_argument("--dither", default="none", choices=list(ImageProcessor.DITHER_METHODS.keys()))
+    parser.add_argument("--palette", default=None, choices=list(ImageProcessor.PALETTES.keys()))
+    parser.add_argument("--filter", default="none",
+                        help='Filter or comma-separated chain, e.g. "grayscale,contrast:1.3,gamma:1.2"')
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between folder scans")
+    parser.add_argument("--settle", type=float, default=2.0,
+                        help="Seconds a file must stay unchanged before it is converted")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker threads")
+    parser.add_argument("--memory-mb", type=int, default=1024, help="Memory budget for running jobs")
+    return parser.parse_args(argv)
+
+def format_stats(stats):
+    """Format watcher statistics as one status line"""
+    line = f"queue: {stats['queue_depth']}  processed: {stats['processed']}  errors: {len(stats['errors'])}"
+    if stats["poll_errors"]:
+        line += f"  scan errors: {stats['poll_errors']} (last: {stats['last_poll_error']})"
+    if stats["mean_latency"] is not None:
+        line += f"  latency: last {stats['last_latency']:.2f}s, mean {stats['mean_latency']:.2f}s"
+    return line
+
+def main(argv=None):
+    """Run the watcher until interrupted"""
+    args = parse_args(argv)
+
+    try:
+        processor = BatchProcessor(
+            args.pixel_size, args.color_count, args.dither, args.palette, args.filter,
+            memory_budget=args.memory_mb << 20, max_workers=args.workers
+        )
+        watcher = FolderWatcher(args.input, args.output, processor, args.interval, args.settle)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Watching {args.input}, press Ctrl+C to stop")
+    watcher.start(on_poll=lambda stats: print(format_stats(stats), end="\r", flush=True))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("\nStopping, waiting for queued files...")
+        watcher.stop()
+        print(format_stats(watcher.stats()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the AtlasPacker class.
+"""
+import unittest
+import sys
+import json
+import tempfile
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.atlas import AtlasPacker
+
+class TestAtlasPacker(unittest.TestCase):
+    """Test cases for the AtlasPacker class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0)]
+        self.sprites = {
+            f"sprite_{i}.png": Image.new('RGB', (8 + i * 4, 16 - i * 2), color=colors[i])
+            for i in range(4)
+        }
+
+    def test_pack_no_overlap(self):
+        """Test that packed rectangles stay on the page and never overlap."""
+        packer = AtlasPacker(max_size=32, padding=1)
+        sizes = [(10, 10)] * 12
+        placements, page_sizes = packer.pack(sizes)
+
+        self.assertGreater(len(page_sizes), 1)
+        rects = {}
+        for (w, h), (page, x, y) in zip(sizes, placements):
+            self.assertLessEqual(x + w, page_sizes[page][0])
+            self.assertLessEqual(y + h, page_sizes[page][1])
+            for ox, oy in rects.get(page, []):
+                self.assertTrue(x + w <= ox or ox + 10 <= x or y + h <= oy or oy + 10 <= y)
+            rects.setdefault(page, []).append((x, y))
+
+    def test_pack_too_large(self):
+        """Test error handling for sprites larger than a page."""
+        with self.assertRaises(ValueError):
+            AtlasPacker(max_size=16).pack([(17, 4)])
+
+    def test_build_lossless_shared_palette(self):
+        """Test that sprites are recoverable from the atlas when colors fit."""
+        packer = AtlasPacker(max_size=64)
+        pages, index = packer.build(self.sprites, color_count=16)
+
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(pages[0].mode, 'P')
+        for name, sprite in self.sprites.items():
+            entry = index[name]
+            region = pages[entry["page"]].crop(
+                (entry["x"], entry["y"], entry["x"] + entry["w"], entry["y"] + entry["h"])
+            )
+            self.assertEqual(region.convert('RGB').tobytes(), sprite.tobytes())
+
+    def test_build_scale(self):
+        """Test that scaling at pack time matches packing upscaled sprites."""
+        packer = AtlasPacker(max_size=256)
+        upscaled = {name: sprite.resize((sprite.width * 4, sprite.height * 4), Image.Resampling.NEAREST)
+                    for name, sprite in self.sprites.items()}
+        expected_pages, expected_index = packer.build(upscaled, color_count=16)
+        pages, index = packer.build(self.sprites, color_count=16, scale=4)
+
+        self.assertEqual(index, expected_index)
+        self.assertEqual([page.tobytes() for page in pages], [page.tobytes() for page in expected_pages])
+
+    def test_build_keeps_transparency(self):
+        """Test that transparent sprites stay transparent in the atlas."""
+        sprite = Image.new('RGBA', (8, 8), (0, 0, 0, 0))
+        sprite.paste((255, 0, 0, 255), (2, 2, 6, 6))
+        pages, index = AtlasPacker(max_size=64, padding=0).build({"sprite.png": sprite, **self.sprites})
+        
+        entry = index["sprite.png"]
+        page = pages[entry["page"]].convert('RGBA')
+        self.assertIn("transparency", pages[entry["page"]].info)
+        self.assertEqual(page.getpixel((entry["x"], entry["y"]))[3], 0)
+        self.assertEqual(page.getpixel((entry["x"] + 3, entry["y"] + 3)), (255, 0, 0, 255))
+    
+    def test_save_writes_index(self):
+        """Test that save writes every page and a JSON index."""
+        packer = AtlasPacker(max_size=64)
+        pages, index = packer.build(self.sprites, color_count=2)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index_path = AtlasPacker.save(pages, index, tmp)
+            with open(index_path) as f:
+                data = json.load(f)
+            self.assertEqual(set(data["sprites"]), set(self.sprites))
+            for page in data["pages"]:
+                self.assertTrue((Path(tmp) / page["file"]).exists())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for batch processing and the memory scheduler.
+"""
+import unittest
+import sys
+import json
+import tempfile
+import threading
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.batch import BatchProcessor, MemoryScheduler
+
+class TestMemoryScheduler(unittest.TestCase):
+    """Test cases for the MemoryScheduler class."""
+    
+    def test_budget_limits_admission(self):
+        """Test that jobs wait until memory is released."""
+        scheduler = MemoryScheduler(100)
+        self.assertTrue(scheduler.acquire(60))
+        self.assertFalse(scheduler.acquire(60, timeout=0.01))
+        
+        threading.Timer(0.05, scheduler.release, args=(60,)).start()
+        self.assertTrue(scheduler.acquire(60, timeout=1))
+    
+    def test_oversized_job_runs_alone(self):
+        """Test that a job larger than the budget is admitted when idle."""
+        scheduler = MemoryScheduler(100)
+        self.assertTrue(scheduler.acquire(500, timeout=0.01))
+        self.assertFalse(scheduler.acquire(1, timeout=0.01))
+
+class TestBatchProcessor(unittest.TestCase):
+    """Test cases for the BatchProcessor class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = Path(self.tmp.name) / "in"
+        self.output_dir = Path(self.tmp.name) / "out"
+        self.input_dir.mkdir()
+        self.output_dir.mkdir()
+        for i, color in enumerate(['red', 'green', 'blue']):
+            Image.new('RGB', (40 + i * 8, 32), color=color).save(self.input_dir / f"img_{i}.png")
+        (self.input_dir / "notes.txt").write_text("not an image")
+    
+    def tearDown(self):
+        """Remove temporary files."""
+        self.tmp.cleanup()
+    
+    def test_estimate_footprint(self):
+        """Test the header based memory estimate."""
+        processor = BatchProcessor(8, 16)
+        # Decoded RGB, its tobytes() copy for deduplication and the 'P' output
+        self.assertEqual(processor.estimate_footprint(self.input_dir / "img_0.png"), 40 * 32 * (4 + 3 + 1))
+        
+        sprite = Image.new('P', (40, 32))
+        sprite.info["transparency"] = 0
+        sprite.save(self.input_dir / "sprite.png", transparency=0)
+        # Decoded 'P', the RGBA copy made by downsample and the 'P' output
+        processor = BatchProcessor(8, 16, deduplicate=False)
+        self.assertEqual(processor.estimate_footprint(self.input_dir / "sprite.png"), 40 * 32 * (1 + 4 + 1))
+    
+    def test_run_small_budget(self):
+        """Test that a budget smaller than any job still converts every file."""
+        processor = BatchProcessor(8, 16, filter_type="invert", memory_budget=1, max_workers=4)
+        paths = BatchProcessor.find_images(self.input_dir)
+        self.assertEqual(len(paths), 3)
+        
+        summary = processor.run(paths, self.output_dir)
+        self.assertEqual(summary["processed"], 3)
+        self.assertEqual(summary["errors"], [])
+        self.assertEqual(processor.scheduler.in_use, 0)
+        
+        with Image.open(self.output_dir / "pixel_img_0.png") as result:
+            self.assertEqual(result.convert("RGB").getpixel((0, 0)), (0, 255, 255))
+    
+    def test_run_auto_colors(self):
+        """Test batch conversion with an automatic color count."""
+        processor = BatchProcessor(8, "auto")
+        summary = processor.run(BatchProcessor.find_images(self.input_dir), self.output_dir)
+        self.assertEqual(summary["processed"], 3)
+        with Image.open(self.output_dir / "pixel_img_1.png") as result:
+            self.assertEqual(len(result.getcolors()), 1)
+    
+    def test_run_reports_errors(self):
+        """Test that unreadable files are reported instead of aborting."""
+        (self.input_dir / "broken.png").write_bytes(b"not a png")
+        processor = BatchProcessor(8, 16)
+        summary = processor.run(BatchProcessor.find_images(self.input_dir), self.output_dir)
+        self.assertEqual(summary["processed"], 3)
+        self.assertEqual([name for name, _ in summary["errors"]], ["broken.png"])
+    
+    def test_run_deduplicates(self):
+        """Test that byte- and pixel-identical inputs are converted once."""
+        (self.input_dir / "copy_0.png").write_bytes((self.input_dir / "img_0.png").read_bytes())
+        Image.new('RGB', (40, 32), color='red').save(self.input_dir / "resaved_0.bmp")
+        
+        processor = BatchProcessor(8, 16, max_workers=1)
+        summary = processor.run(BatchProcessor.find_images(self.input_dir), self.output_dir)
+        self.assertEqual(summary["processed"], 3)
+        self.assertEqual(summary["duplicates"], 2)
+        self.assertEqual(summary["saved_pixels"], 2 * 40 * 32)
+        
+        original = (self.output_dir / "pixel_img_0.png").read_bytes()
+        self.assertEqual((self.output_dir / "pixel_copy_0.png").read_bytes(), original)
+        with Image.open(self.output_dir / "pixel_resaved_0.bmp") as result:
+            self.assertEqual(result.convert("RGB").getpixel((0, 0)), (255, 0, 0))
+    
+    def test_rerun_does_not_write_through_links(self):
+        """Test that re-running into the same folder leaves linked duplicates intact."""
+        Image.new('RGB', (40, 32), color='red').save(self.input_dir / "img_1.png")
+        processor = BatchProcessor(8, 16)
+        paths = BatchProcessor.find_images(self.input_dir)
+        self.assertEqual(processor.run(paths, self.output_dir)["duplicates"], 1)
+        
+        Image.new('RGB', (48, 32), color='blue').save(self.input_dir / "img_1.png")
+        summary = processor.run(paths, self.output_dir)
+        self.assertEqual(summary["duplicates"], 0)
+        with Image.open(self.output_dir / "pixel_img_0.png") as result:
+            self.assertEqual(result.convert("RGB").getpixel((0, 0)), (255, 0, 0))
+        with Image.open(self.output_dir / "pixel_img_1.png") as result:
+            self.assertEqual(result.convert("RGB").getpixel((0, 0)), (0, 0, 255))
+        self.assertEqual(sorted(p.name for p in self.output_dir.iterdir() if p.name.startswith(".")), [])
+    
+    def test_run_atlas(self):
+        """Test atlas output mode."""
+        processor = BatchProcessor(8, 16)
+        (self.input_dir / "copy_0.png").write_bytes((self.input_dir / "img_0.png").read_bytes())
+        processor.run(BatchProcessor.find_images(self.input_dir), self.output_dir, pack_atlas=True)
+        with open(self.output_dir / "atlas.json") as f:
+            sprites = json.load(f)["sprites"]
+        self.assertEqual(sprites["copy_0.png"], sprites["img_0.png"])
+        self.assertFalse((self.output_dir / "pixel_img_0.png").exists())
+    
+    def test_atlas_reports_oversized_sprites(self):
+        """Test that sprites too large for a page are reported and the rest are packed."""
+        Image.new('RGB', (2100, 40), color=(0, 255, 0)).save(self.input_dir / "wide.png")
+        (self.input_dir / "wide_copy.png").write_bytes((self.input_dir / "wide.png").read_bytes())
+        processor = BatchProcessor(8, 16)
+        summary = processor.run(BatchProcessor.find_images(self.input_dir), self.output_dir, pack_atlas=True)
+        
+        self.assertEqual(summary["processed"], 3)
+        self.assertEqual(sorted(name for name, _ in summary["errors"]), ["wide.png", "wide_copy.png"])
+        with open(self.output_dir / "atlas.json") as f:
+            sprites = json.load(f)["sprites"]
+        self.assertEqual(sorted(sprites), ["img_0.png", "img_1.png", "img_2.png"])
+    
+    def test_atlas_matches_files_with_fixed_palette(self):
+        """Test that atlas rectangles hold the same pixels as per-file output."""
+        gradient = Image.linear_gradient('L').resize((64, 64)).convert('RGB')
+        Image.merge('RGB', (gradient.getchannel(0), gradient.rotate(90).getchannel(0),
+                            gradient.rotate(180).getchannel(0))).save(self.input_dir / "img_0.png")
+        paths = BatchProcessor.find_images(self.input_dir)
+        processor = BatchProcessor(4, 16, palette_name="nes")
+        processor.run(paths, self.output_dir)
+        atlas_dir = self.output_dir / "atlas"
+        atlas_dir.mkdir()
+        processor.run(paths, atlas_dir, pack_atlas=True)
+        
+        with open(atlas_dir / "atlas.json") as f:
+            sprites = json.load(f)["sprites"]
+        for path in paths:
+            rect = sprites[path.name]
+            with Image.open(atlas_dir / f"atlas_{rect['page']}.png") as page, \
+                    Image.open(self.output_dir / f"pixel_{path.name}") as expected:
+                sprite = page.crop((rect["x"], rect["y"], rect["x"] + rect["w"], rect["y"] + rect["h"]))
+                self.assertEqual(sprite.convert("RGB").tobytes(), expected.convert("RGB").tobytes())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the FilterChain class.
+"""
+import unittest
+import sys
+from pathlib import Path
+from PIL import Image
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.filters import FilterChain
+from src.image_processor.processor import ImageProcessor
+
+class TestFilterChain(unittest.TestCase):
+    """Test cases for the FilterChain class."""
+
+    def setUp(self):
+        """Set up a gradient test image"""
+        x = np.arange(64, dtype=np.uint8)[None, :] * 4
+        rgb = np.stack([np.repeat(x, 16, axis=0), np.repeat(x[:, ::-1], 16, axis=0),
+                        np.full((16, 64), 100, np.uint8)], axis=2)
+        self.test_image = Image.fromarray(rgb, "RGB")
+
+    def test_single_filters(self):
+        """Test the basic filters on known colors."""
+        image = Image.new('RGB', (1, 1), (200, 100, 50))
+        self.assertEqual(FilterChain("invert").apply_rgb(image).getpixel((0, 0)), (55, 155, 205))
+        gray = FilterChain("grayscale").apply_rgb(image).getpixel((0, 0))
+        self.assertEqual(gray[0], gray[1])
+        self.assertEqual(gray[1], gray[2])
+        white = Image.new('RGB', (1, 1), (255, 255, 255))
+        self.assertEqual(FilterChain("sepia").apply_rgb(white).getpixel((0, 0)), (255, 255, 238))
+
+    def test_sepia_and_grayscale_round_down(self):
+        """Test that sepia and grayscale keep the results of the original truncating formulas."""
+        rng = np.random.default_rng(0)
+        image = Image.fromarray(rng.integers(0, 256, (64, 64, 3), dtype=np.uint8), "RGB")
+        r, g, b = (np.asarray(image)[:, :, c].astype(np.float64) for c in range(3))
+        sepia = np.stack([np.minimum(0.393 * r + 0.769 * g + 0.189 * b, 255),
+                          np.minimum(0.349 * r + 0.686 * g + 0.168 * b, 255),
+                          np.minimum(0.272 * r + 0.534 * g + 0.131 * b, 255)], axis=2).astype(np.uint8)
+        gray = (0.2989 * r + 0.5870 * g + 0.1140 * b).astype(np.uint8)
+        for spec, expected in [("sepia", sepia), ("grayscale", np.stack([gray] * 3, axis=2))]:
+            # Pillow works in float32, so values that are almost exact integers may land one step off
+            difference = np.abs(np.asarray(FilterChain(spec).apply_rgb(image), int) - expected)
+            self.assertLessEqual(difference.max(), 1)
+            self.assertLess(np.count_nonzero(difference), difference.size // 1000)
+
+    def test_affine_filters_fuse_into_one_pass(self):
+        """Test that a chain of affine filters matches applying them one at a time."""
+        chain = FilterChain("grayscale,contrast:1.5,invert,brightness:0.9")
+        self.assertEqual(len(chain.passes), 1)
+
+        expected = self.test_image
+        for spec in ["grayscale", "contrast:1.5", "invert", "brightness:0.9"]:
+            expected = FilterChain(spec).apply_rgb(expected)
+        # One rounding instead of four, so values may differ by a step or two
+        difference = np.abs(np.asarray(chain.apply_rgb(self.test_image), int) - np.asarray(expected, int))
+        self.assertLessEqual(difference.max(), 2)
+
+    def test_fused_chain_clips_once(self):
+        """Test that a fused chain only clips its final result."""
+        image = Image.new('RGB', (2, 1))
+        image.putpixel((1, 0), (255, 200, 32))
+        # contrast:2 then brightness:0.5 fuse into x - 64, which never clips above 255
+        chain = FilterChain("contrast:2,brightness:0.5")
+        result = chain.apply_rgb(image)
+        self.assertEqual(result.getpixel((0, 0)), (0, 0, 0))
+        self.assertEqual(result.getpixel((1, 0)), (191, 136, 0))
+        # One filter at a time clips 2 * 255 - 128 to 255 before halving it
+        sequential = FilterChain("brightness:0.5").apply_rgb(FilterChain("contrast:2").apply_rgb(image))
+        self.assertEqual(sequential.getpixel((1, 0)), (128, 128, 0))
+
+    def test_curves_fuse(self):
+        """Test that consecutive gamma curves fuse into one lookup table."""
+        chain = FilterChain(["gamma:2", "gamma:0.5"])
+        self.assertEqual(len(chain.passes), 1)
+        result = np.asarray(chain.apply_rgb(self.test_image), int)
+        self.assertLessEqual(np.abs(result - np.asarray(self.test_image, int)).max(), 2)
+
+        # A curve between matrices starts a new pass
+        self.assertEqual(len(FilterChain("sepia,gamma:2.2,invert").passes), 3)
+
+    def test_empty_chain(self):
+        """Test that "none" gives an empty chain that leaves images alone."""
+        chain = FilterChain("none")
+        self.assertFalse(chain)
+        self.assertIs(ImageProcessor.apply_filter(self.test_image, chain), self.test_image)
+
+    def test_invalid_specs(self):
+        """Test error handling for bad filter specs."""
+        with self.assertRaises(ValueError):
+            FilterChain("blur")
+        with self.assertRaises(ValueError):
+            FilterChain("contrast")
+        with self.assertRaises(ValueError):
+            FilterChain("gamma:-1")
+        with self.assertRaises(ValueError):
+            FilterChain("invert:2")
+
+    def test_chain_on_indexed_and_alpha_images(self):
+        """Test that chains reach 'P' palettes and visible RGBA pixels."""
+        pixel_art = ImageProcessor.reduce_colors(self.test_image, 8)
+        filtered = ImageProcessor.apply_filter(pixel_art, "invert,sepia")
+        self.assertEqual(filtered.mode, 'P')
+        expected = FilterChain("invert,sepia").apply_rgb(pixel_art.convert('RGB'))
+        self.assertEqual(filtered.convert('RGB').tobytes(), expected.tobytes())
+
+        sprite = self.test_image.convert('RGBA')
+        sprite.putpixel((0, 0), (10, 20, 30, 0))
+        filtered = ImageProcessor.apply_filter(sprite, "grayscale,invert")
+        self.assertEqual(filtered.getpixel((0, 0)), (10, 20, 30, 0))
+        self.assertEqual(filtered.getpixel((1, 0))[3], 255)
+
+if __name__ == '__main__':
+    unittest.main()
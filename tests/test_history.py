@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the ImageHistory class.
+"""
+import unittest
+import sys
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.ui.history import ImageHistory
+
+class TestImageHistory(unittest.TestCase):
+    """Test cases for the ImageHistory class."""
+    
+    def _state(self, size=10):
+        """Create a small 'P' image"""
+        return Image.new('P', (size, size))
+    
+    def test_undo_redo(self):
+        """Test stepping back and forth through states."""
+        history = ImageHistory()
+        first, second = self._state(), self._state()
+        history.push(first, 8, "Convert")
+        history.push(second, 8, "invert filter")
+        
+        self.assertIs(history.undo()["image"], first)
+        self.assertIsNone(history.undo())
+        self.assertIs(history.redo()["image"], second)
+        self.assertFalse(history.can_redo)
+    
+    def test_push_clears_redo(self):
+        """Test that a new state drops the redo states."""
+        history = ImageHistory()
+        history.push(self._state(), 8, "Convert")
+        history.push(self._state(), 8, "sepia filter")
+        history.undo()
+        history.push(self._state(), 8, "invert filter")
+        self.assertFalse(history.can_redo)
+        self.assertEqual(history.memory_used, 2 * (100 + 768))
+    
+    def test_memory_cap_evicts_oldest(self):
+        """Test that old states are evicted once the cap is exceeded."""
+        history = ImageHistory(max_bytes=3 * (100 + 768))
+        states = [self._state() for _ in range(5)]
+        for i, state in enumerate(states):
+            history.push(state, 8, f"step {i}")
+        
+        self.assertLessEqual(history.memory_used, history.max_bytes)
+        self.assertIs(history.undo()["image"], states[3])
+        self.assertIs(history.undo()["image"], states[2])
+        self.assertIsNone(history.undo())
+    
+    def test_current_state_always_kept(self):
+        """Test that a state larger than the cap still becomes current."""
+        history = ImageHistory(max_bytes=10)
+        history.push(self._state(), 8, "Convert")
+        self.assertIsNotNone(history.current)
+        self.assertFalse(history.can_undo)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the TileParallelConverter class.
+"""
+import unittest
+import sys
+from pathlib import Path
+from PIL import Image, ImageDraw
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.parallel import TileParallelConverter
+
+class TestTileParallelConverter(unittest.TestCase):
+    """Test cases for the TileParallelConverter class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_image = Image.new('RGB', (157, 203), color='white')
+        draw = ImageDraw.Draw(self.test_image)
+        draw.rectangle([(10, 10), (80, 120)], fill=(255, 0, 0))
+        draw.ellipse([(60, 90), (150, 190)], fill=(0, 0, 255))
+        self.converter = TileParallelConverter(max_workers=4)
+    
+    def test_downsample_bands_match_full_resize(self):
+        """Test that tiled downsampling matches a full-image resize."""
+        for pixel_size in [3, 8, 13]:
+            expected = ImageProcessor.downsample(self.test_image, pixel_size)
+            width, height = expected.size
+            small = Image.new('RGB', expected.size)
+            for band in self.converter._bands(height):
+                tile = self.converter._downsample_band(self.test_image, width, self.test_image.height / height, band)
+                small.paste(tile, (0, band[0]))
+            diff = np.abs(np.asarray(small, dtype=int) - np.asarray(expected, dtype=int))
+            self.assertLessEqual(diff.max(), 1)
+    
+    def test_convert(self):
+        """Test tile-parallel conversion output."""
+        pixel_art = self.converter.convert(self.test_image, 8, 4)
+        self.assertEqual(pixel_art.size, (152, 200))
+        self.assertEqual(pixel_art.mode, 'P')
+        self.assertLessEqual(len(pixel_art.getcolors()), 4)
+        
+        # Every block is a single color
+        blocks = np.asarray(pixel_art).reshape(25, 8, 19, 8)
+        self.assertTrue((blocks == blocks[:, :1, :, :1]).all())
+    
+    def test_convert_matches_serial(self):
+        """Test that tiled conversion gives the same colors as convert_to_pixel_art."""
+        rng = np.random.default_rng(0)
+        x, y = np.linspace(0, 255, 320), np.linspace(0, 255, 240)
+        gradient = np.stack([np.add.outer(y * 0, x), np.add.outer(y, x * 0), np.add.outer(y, x) / 2], axis=2)
+        image = Image.fromarray((gradient + rng.normal(0, 20, gradient.shape)).clip(0, 255).astype(np.uint8))
+        for settings in [(8, 16), (4, 16, "none", "nes"), (8, 8, "floyd-steinberg")]:
+            expected = np.asarray(ImageProcessor.convert_to_pixel_art(image, *settings).convert('RGB'), dtype=int)
+            actual = np.asarray(self.converter.convert(image, *settings).convert('RGB'), dtype=int)
+            # Band seams may round a downsampled block by one step
+            self.assertLess((np.abs(actual - expected).max(axis=2) > 8).mean(), 0.01)
+    
+    def test_convert_with_palette_dither_and_filter(self):
+        """Test that palettes, dithering and filters are applied."""
+        pixel_art = self.converter.convert(self.test_image, 4, 16, "floyd-steinberg", "gameboy", "invert")
+        self.assertEqual(pixel_art.mode, 'P')
+        gameboy = {tuple(255 - c for c in color) for color in ImageProcessor.PALETTES["gameboy"]}
+        self.assertTrue({color for _, color in pixel_art.convert('RGB').getcolors()} <= gameboy)
+    
+    def test_convert_keeps_transparency(self):
+        """Test that transparent sources keep transparency across tiles."""
+        sprite = Image.new('RGBA', (64, 96), (0, 0, 0, 0))
+        ImageDraw.Draw(sprite).ellipse([(8, 8), (56, 88)], fill=(255, 0, 0, 255))
+        pixel_art = self.converter.convert(sprite, 8, 8)
+        self.assertIn("transparency", pixel_art.info)
+        self.assertEqual(pixel_art.convert('RGBA').getpixel((0, 0))[3], 0)
+        self.assertEqual(pixel_art.convert('RGBA').getpixel((32, 48))[3], 255)
+    
+    def test_apply_filter_matches_serial(self):
+        """Test that the tiled filter matches the single-threaded one."""
+        expected = ImageProcessor.apply_filter(self.test_image, "sepia")
+        self.assertEqual(self.converter.apply_filter(self.test_image, "sepia").tobytes(), expected.tobytes())
+        
+        # Converted images are 'P', possibly with a transparent index
+        sprite = Image.new('RGBA', (64, 96), (0, 0, 0, 0))
+        ImageDraw.Draw(sprite).ellipse([(8, 8), (56, 88)], fill=(255, 0, 0, 255))
+        for source in (self.converter.convert(self.test_image, 8, 4), self.converter.convert(sprite, 8, 8)):
+            expected = ImageProcessor.apply_filter(source, "invert")
+            filtered = self.converter.apply_filter(source, "invert")
+            self.assertEqual(filtered.info, expected.info)
+            self.assertEqual(filtered.convert('RGBA').tobytes(), expected.convert('RGBA').tobytes())
+        
+        with self.assertRaises(ValueError):
+            self.converter.apply_filter(self.test_image, "unknown")
+
+if __name__ == '__main__':
+    unittest.main()
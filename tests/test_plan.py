@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the ConversionPlan class.
+"""
+import unittest
+import sys
+from pathlib import Path
+from PIL import Image
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.plan import ConversionPlan
+from src.image_processor.processor import ImageProcessor
+
+class TestConversionPlan(unittest.TestCase):
+    """Test cases for the ConversionPlan class."""
+
+    def setUp(self):
+        """Set up test images"""
+        rng = np.random.default_rng(0)
+        self.test_image = Image.fromarray(rng.integers(0, 256, (64, 96, 3), dtype=np.uint8), "RGB")
+        self.sprite = self.test_image.convert('RGBA')
+        self.sprite.paste((0, 0, 0, 0), (0, 0, 32, 32))
+
+    def _expected(self, image, pixel_size, color_count, dither_method="none", palette_name=None, filter_type="none"):
+        """Convert with the one-off ImageProcessor calls"""
+        small = ImageProcessor.downsample(image, pixel_size)
+        small = ImageProcessor.reduce_colors(small, color_count, dither_method, palette_name)
+        small = ImageProcessor.apply_filter(small, filter_type)
+        return ImageProcessor.upscale(small, pixel_size)
+
+    def test_matches_processor(self):
+        """Test that plans give the same results as ImageProcessor."""
+        cases = [
+            (4, 16),
+            (8, 8, "floyd-steinberg"),
+            (4, 16, "none", "gameboy"),
+            (4, 16, "none", "nes", "sepia,contrast:1.2"),
+            (4, 8, "none", None, "invert"),
+            (8, "auto", "none", "cga", "grayscale"),
+        ]
+        for image in (self.test_image, self.sprite):
+            for settings in cases:
+                with self.subTest(mode=image.mode, settings=settings):
+                    result = ConversionPlan(*settings).convert(image)
+                    expected = self._expected(image, *settings)
+                    self.assertEqual(result.mode, 'P')
+                    self.assertEqual(result.info.get("transparency"), expected.info.get("transparency"))
+                    self.assertEqual(result.convert('RGBA').tobytes(), expected.convert('RGBA').tobytes())
+
+    def test_reuse(self):
+        """Test that one plan converts many images without changing its palette."""
+        plan = ConversionPlan(4, 16, palette_name="gameboy", filter_type="invert")
+        first = plan.convert(self.test_image, upscale=False)
+        second = plan.convert(self.test_image.transpose(Image.Transpose.ROTATE_180), upscale=False)
+        self.assertEqual(first.getpalette(), second.getpalette())
+        self.assertEqual(ImageProcessor.palette_image("gameboy").getpalette()[:3], [15, 56, 15])
+        self.assertEqual(first.size, (24, 16))
+
+    def test_invalid_settings(self):
+        """Test that settings are validated when the plan is built."""
+        with self.assertRaises(ValueError):
+            ConversionPlan(0, 16)
+        with self.assertRaises(ValueError):
+            ConversionPlan(4, 300)
+        with self.assertRaises(ValueError):
+            ConversionPlan(4, 16, "bayer")
+        with self.assertRaises(ValueError):
+            ConversionPlan(4, 16, filter_type="blur")
+        with self.assertRaises(TypeError):
+            ConversionPlan(4, 16).convert("not an image")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -54,6 +54,80 @@ class TestImageProcessor(unittest.TestCase):
         with self.assertRaises(TypeError):
             ImageProcessor.convert_to_pixel_art("not an image", 10, 8)
     
+    def test_convert_to_pixel_art_alpha(self):
+        """Test that transparent blocks stay transparent in indexed output."""
+        sprite = Image.new('RGBA', (80, 80), (0, 0, 0, 0))
+        from PIL import ImageDraw
+        ImageDraw.Draw(sprite).rectangle([(20, 20), (59, 59)], fill=(0, 255, 0, 255))
+        
+        pixel_art = ImageProcessor.convert_to_pixel_art(sprite, 10, 8)
+        self.assertEqual(pixel_art.mode, 'P')
+        transparent = pixel_art.info["transparency"]
+        self.assertEqual(pixel_art.getpixel((0, 0)), transparent)
+        self.assertNotEqual(pixel_art.getpixel((40, 40)), transparent)
+        
+        # Only the opaque color counts toward the palette
+        self.assertEqual(pixel_art.convert('RGBA').getpixel((40, 40)), (0, 255, 0, 255))
+    
+    def test_fixed_palette_same_with_and_without_alpha(self):
+        """Test that an alpha channel does not change which palette colors are used."""
+        for color_count in [2, 16]:
+            opaque = ImageProcessor.convert_to_pixel_art(self.test_image, 10, color_count, palette_name="gameboy")
+            with_alpha = ImageProcessor.convert_to_pixel_art(
+                self.test_image.convert('RGBA'), 10, color_count, palette_name="gameboy")
+            self.assertEqual(with_alpha.convert('RGB').tobytes(), opaque.convert('RGB').tobytes())
+    
+    def test_dithered_alpha_ignores_hidden_colors(self):
+        """Test that colors under transparent pixels do not diffuse into the sprite."""
+        noise = Image.frombytes('RGB', (16, 16), bytes((i * 97 + 31) % 256 for i in range(16 * 16 * 3)))
+        for palette_name in [None, "nes"]:
+            results = []
+            for hidden in [(0, 0, 0), (130, 37, 200)]:
+                sprite = Image.new('RGBA', (32, 32), hidden + (0,))
+                sprite.paste(noise, (8, 8))
+                results.append(ImageProcessor.reduce_colors(sprite, 8, "floyd-steinberg", palette_name))
+            self.assertEqual(results[0].convert('RGBA').tobytes(), results[1].convert('RGBA').tobytes())
+    
+    def test_dithered_alpha_with_small_opaque_region(self):
+        """Test dithering a large, mostly transparent sprite."""
+        sprite = Image.new('RGBA', (600, 600), (0, 0, 0, 0))
+        sprite.paste((200, 40, 40, 255), (590, 0, 600, 10))
+        sprite.paste((40, 40, 200, 255), (0, 590, 10, 600))
+        result = ImageProcessor.reduce_colors(sprite, 4, "floyd-steinberg").convert('RGBA')
+        self.assertEqual(result.getpixel((595, 5)), (200, 40, 40, 255))
+        self.assertEqual(result.getpixel((5, 595)), (40, 40, 200, 255))
+        self.assertEqual(result.getpixel((300, 300))[3], 0)
+    
+    def test_apply_filter_indexed_and_alpha(self):
+        """Test filters on 'P' and RGBA images."""
+        pixel_art = ImageProcessor.convert_to_pixel_art(self.test_image, 10, 8)
+        inverted = ImageProcessor.apply_filter(pixel_art, "invert")
+        self.assertEqual(inverted.mode, 'P')
+        before = pixel_art.convert('RGB').getpixel((0, 0))
+        self.assertEqual(inverted.convert('RGB').getpixel((0, 0)), tuple(255 - c for c in before))
+        
+        sprite = Image.new('RGBA', (4, 4), (255, 255, 255, 0))
+        sprite.putpixel((1, 1), (255, 255, 255, 255))
+        inverted = ImageProcessor.apply_filter(sprite, "invert")
+        self.assertEqual(inverted.getpixel((1, 1)), (0, 0, 0, 255))
+        self.assertEqual(inverted.getpixel((0, 0)), (255, 255, 255, 0))
+    
+    def test_auto_color_count(self):
+        """Test that "auto" picks the fewest colors meeting the quality target."""
+        # Three flat colors are reproduced exactly with three palette entries
+        small = ImageProcessor.downsample(self.test_image, 10)
+        flat = small.quantize(3).convert('RGB')
+        self.assertEqual(ImageProcessor.auto_color_count(flat, target_psnr=60), 3)
+        
+        pixel_art = ImageProcessor.convert_to_pixel_art(self.test_image, 10, "auto")
+        self.assertGreaterEqual(
+            ImageProcessor.psnr(small, pixel_art.resize(small.size, Image.Resampling.NEAREST)),
+            ImageProcessor.AUTO_COLOR_PSNR
+        )
+        
+        with self.assertRaises(ValueError):
+            ImageProcessor.convert_to_pixel_art(self.test_image, 10, "many")
+    
     def test_resize_with_aspect_ratio(self):
         """Test image resizing with aspect ratio preservation."""
         # Create a rectangular image
@@ -79,5 +153,18 @@ class TestImageProcessor(unittest.TestCase):
         with self.assertRaises(TypeError):
             ImageProcessor.resize_with_aspect_ratio("not an image", (50, 50))
 
+    def test_resize_nearest_integer(self):
+        """Test integer NEAREST scaling for previews."""
+        # Small images are enlarged by a whole factor
+        small = Image.new('RGB', (30, 10), color='white')
+        self.assertEqual(ImageProcessor.resize_nearest_integer(small, (100, 100)).size, (90, 30))
+        
+        # Large images are shrunk by a whole divisor
+        large = Image.new('RGB', (1000, 500), color='white')
+        self.assertEqual(ImageProcessor.resize_nearest_integer(large, (400, 400)).size, (333, 166))
+        
+        with self.assertRaises(ValueError):
+            ImageProcessor.resize_nearest_integer(small, (0, 10))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
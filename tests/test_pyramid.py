@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the ResolutionPyramid class.
+"""
+import unittest
+import sys
+from pathlib import Path
+from PIL import Image, ImageDraw
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.pyramid import ResolutionPyramid
+
+class TestResolutionPyramid(unittest.TestCase):
+    """Test cases for the ResolutionPyramid class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_image = Image.new('RGB', (203, 117), color='white')
+        draw = ImageDraw.Draw(self.test_image)
+        draw.rectangle([(10, 10), (80, 80)], fill=(255, 0, 0))
+        draw.ellipse([(100, 20), (190, 100)], fill=(0, 0, 255))
+    
+    def test_levels_built(self):
+        """Test that levels are halved down to the minimum size."""
+        pyramid = ResolutionPyramid(self.test_image, min_size=8)
+        pyramid.wait()
+        # Heights 117 -> 59 -> 30 -> 15, halving again would go below 8
+        self.assertEqual(pyramid.level_count, 4)
+    
+    def test_downsample_matches_direct_size(self):
+        """Test that pyramid downsamples have the same size as direct ones."""
+        pyramid = ResolutionPyramid(self.test_image, background=False)
+        for pixel_size in [1, 3, 4, 7, 16, 33]:
+            expected = ImageProcessor.downsample(self.test_image, pixel_size)
+            self.assertEqual(pyramid.downsample(pixel_size).size, expected.size)
+    
+    def test_downsample_matches_direct_values(self):
+        """Test that pyramid downsamples stay close to direct ones up to the edges."""
+        x, y = np.linspace(0, 255, 1003), np.linspace(0, 255, 717)
+        gradient = np.stack([np.add.outer(y * 0, x), np.add.outer(y, x * 0), np.add.outer(y, x) / 2], axis=2)
+        image = Image.fromarray(gradient.astype(np.uint8), 'RGB')
+        pyramid = ResolutionPyramid(image, background=False)
+        for pixel_size in [5, 16, 33]:
+            actual = np.asarray(pyramid.downsample(pixel_size), dtype=np.float64)
+            expected = np.asarray(ImageProcessor.downsample(image, pixel_size), dtype=np.float64)
+            difference = np.abs(actual - expected)
+            self.assertLessEqual(difference.max(), 2)
+            self.assertLess(difference[-1].mean(), 1.5)
+            self.assertLess(difference[:, -1].mean(), 1.5)
+    
+    def test_downsample_invalid_pixel_size(self):
+        """Test that invalid pixel sizes are rejected."""
+        pyramid = ResolutionPyramid(self.test_image, background=False)
+        with self.assertRaises(ValueError):
+            pyramid.downsample(0)
+    
+    def test_unreducible_mode(self):
+        """Test that palette images fall back to the source level."""
+        pyramid = ResolutionPyramid(self.test_image.quantize(16), background=False)
+        self.assertEqual(pyramid.level_count, 1)
+        self.assertEqual(pyramid.downsample(8).size, (25, 14))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the ParameterSweep class.
+"""
+import unittest
+import sys
+from pathlib import Path
+from PIL import Image, ImageDraw
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.processor import ImageProcessor
+from src.image_processor.sweep import ParameterSweep
+
+class TestParameterSweep(unittest.TestCase):
+    """Test cases for the ParameterSweep class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_image = Image.new('RGB', (64, 48), color='white')
+        draw = ImageDraw.Draw(self.test_image)
+        draw.rectangle([(8, 8), (30, 30)], fill=(255, 0, 0))
+        draw.ellipse([(34, 10), (60, 40)], fill=(0, 0, 255))
+    
+    def test_run_matches_convert(self):
+        """Test that sweep results match individual conversions."""
+        sweep = ParameterSweep([4, 8], [2, 8], ["none", "floyd-steinberg"], [None, "gameboy"])
+        results = sweep.run(self.test_image)
+        self.assertEqual(len(results), 16)
+        
+        for result in results:
+            expected = ImageProcessor.convert_to_pixel_art(
+                self.test_image, result["pixel_size"], result["color_count"],
+                result["dither_method"], result["palette_name"]
+            )
+            actual = ImageProcessor.upscale(result["image"], result["pixel_size"])
+            self.assertEqual(actual.convert('RGB').tobytes(), expected.convert('RGB').tobytes())
+    
+    def test_invalid_settings(self):
+        """Test error handling for invalid sweep settings."""
+        with self.assertRaises(ValueError):
+            ParameterSweep([0], [8])
+        with self.assertRaises(ValueError):
+            ParameterSweep([4], [8], palette_names=["unknown"])
+        with self.assertRaises(ValueError):
+            ParameterSweep([], [8])
+    
+    def test_contact_sheet(self):
+        """Test contact sheet layout."""
+        results = ParameterSweep([4, 8], [4, 8, 16]).run(self.test_image)
+        sheet = ParameterSweep.contact_sheet(results, cell_size=40, columns=3)
+        self.assertEqual(sheet.mode, 'RGB')
+        self.assertEqual(sheet.width % 3, 0)
+        self.assertGreater(sheet.height, 80)
+
+if __name__ == '__main__':
+    unittest.main()
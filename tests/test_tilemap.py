@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the TilemapExporter class.
+"""
+import unittest
+import sys
+import json
+import tempfile
+from pathlib import Path
+from PIL import Image
+import numpy as np
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.tilemap import TilemapExporter
+from src.image_processor.processor import ImageProcessor
+
+class TestTilemapExporter(unittest.TestCase):
+    """Test cases for the TilemapExporter class."""
+
+    def setUp(self):
+        """Set up a 'P' level built from two 4x4 tiles, one of them also mirrored"""
+        rng = np.random.default_rng(0)
+        self.tile_a = rng.integers(0, 4, (4, 4), dtype=np.uint8)
+        self.tile_b = rng.integers(0, 4, (4, 4), dtype=np.uint8)
+        layout = [[self.tile_a, self.tile_b, self.tile_a[:, ::-1]],
+                  [self.tile_b, self.tile_a[::-1], self.tile_a]]
+        self.level = Image.fromarray(np.block(layout), "P")
+        self.level.putpalette([0, 0, 0, 255, 0, 0, 0, 255, 0, 0, 0, 255])
+
+    def _rebuild(self, tiles, tilemap, flips):
+        """Reassemble the level from its tiles, map and flip codes"""
+        variants = np.stack([tiles, tiles[:, :, ::-1], tiles[:, ::-1], tiles[:, ::-1, ::-1]], axis=1)
+        cells = variants[tilemap, flips]
+        rows, cols, t = tilemap.shape[0], tilemap.shape[1], tiles.shape[1]
+        return cells.swapaxes(1, 2).reshape(rows * t, cols * t)
+
+    def test_build_deduplicates_tiles(self):
+        """Test that identical cells share a tile and the map rebuilds the image."""
+        tiles, tilemap, flips = TilemapExporter(4).build(self.level)
+        self.assertEqual(len(tiles), 4)
+        self.assertEqual(tilemap.tolist(), [[0, 1, 2], [1, 3, 0]])
+        self.assertFalse(flips.any())
+        np.testing.assert_array_equal(self._rebuild(tiles, tilemap, flips), np.asarray(self.level))
+
+    def test_build_matches_flips(self):
+        """Test that mirrored cells reuse one tile with a flip code."""
+        tiles, tilemap, flips = TilemapExporter(4, match_flips=True).build(self.level)
+        self.assertEqual(len(tiles), 2)
+        self.assertEqual(len(set(tilemap.ravel().tolist())), 2)
+        np.testing.assert_array_equal(self._rebuild(tiles, tilemap, flips), np.asarray(self.level))
+
+    def test_partial_tiles_and_rgb(self):
+        """Test RGB images whose size is not a multiple of the tile size."""
+        image = Image.new('RGB', (10, 6), (10, 20, 30))
+        tiles, tilemap, _ = TilemapExporter(4).build(image)
+        self.assertEqual(tilemap.shape, (2, 3))
+        self.assertEqual(tiles.shape[1:], (4, 4, 3))
+        # Full tiles and the three kinds of padded edge tiles
+        self.assertEqual(len(tiles), 4)
+
+    def test_export(self):
+        """Test that export writes a tileset keeping the palette and a JSON map."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            map_path = TilemapExporter(4, match_flips=True).export(self.level, output_dir, "level", pixel_size=2)
+            with open(map_path) as f:
+                data = json.load(f)
+
+            self.assertEqual(data["tile_size"], 8)
+            self.assertEqual((data["width"], data["height"]), (3, 2))
+            self.assertEqual(len(data["map"]), 6)
+            self.assertEqual(len(data["flips"]), 6)
+
+            tileset = Image.open(Path(output_dir) / data["tileset"])
+            self.assertEqual(tileset.mode, 'P')
+            self.assertEqual(tileset.size, (16, 8))
+            self.assertEqual(tileset.getpalette()[:12], self.level.getpalette()[:12])
+
+    def test_converted_image(self):
+        """Test exporting the block grid of a converted image."""
+        image = Image.radial_gradient('L').convert('RGB')
+        small = ImageProcessor.reduce_colors(ImageProcessor.downsample(image, 4), 8)
+        tiles, tilemap, flips = TilemapExporter(8, match_flips=True).build(small)
+        self.assertEqual(tilemap.shape, (8, 8))
+        self.assertLess(len(tiles), 64)
+        np.testing.assert_array_equal(self._rebuild(tiles, tilemap, flips), np.asarray(small))
+
+    def test_invalid_parameters(self):
+        """Test error handling for invalid parameters."""
+        with self.assertRaises(ValueError):
+            TilemapExporter(0)
+        with self.assertRaises(TypeError):
+            TilemapExporter(8).build("not an image")
+
+if __name__ == '__main__':
+    unittest.main()
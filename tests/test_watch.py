@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the FolderWatcher class.
+"""
+import unittest
+import sys
+import tempfile
+import time
+from pathlib import Path
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.image_processor.batch import BatchProcessor
+from src.image_processor.watch import FolderWatcher
+
+class TestFolderWatcher(unittest.TestCase):
+    """Test cases for the FolderWatcher class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = Path(self.tmp.name) / "in"
+        self.output_dir = Path(self.tmp.name) / "out"
+        self.input_dir.mkdir()
+        self.output_dir.mkdir()
+        self.watcher = FolderWatcher(self.input_dir, self.output_dir, BatchProcessor(8, 16), settle_time=0)
+    
+    def tearDown(self):
+        """Stop the watcher and remove temporary files."""
+        self.watcher.stop()
+        self.tmp.cleanup()
+    
+    def test_waits_for_stable_files(self):
+        """Test that files are queued only once they stop changing."""
+        path = self.input_dir / "sprite.png"
+        Image.new('RGB', (32, 32), color='red').save(path)
+        self.assertEqual(self.watcher.poll_once(), [])
+        
+        # Still being written: the size changes between polls
+        Image.new('RGB', (48, 32), color='red').save(path)
+        self.assertEqual(self.watcher.poll_once(), [])
+        
+        self.assertEqual(self.watcher.poll_once(), [path])
+        self.assertEqual(self.watcher.poll_once(), [])
+        
+        self.watcher.stop()
+        stats = self.watcher.stats()
+        self.assertEqual(stats["processed"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertIsNotNone(stats["mean_latency"])
+        self.assertTrue((self.output_dir / "pixel_sprite.png").exists())
+    
+    def test_requeues_modified_files(self):
+        """Test that a modified file is converted again."""
+        path = self.input_dir / "sprite.png"
+        Image.new('RGB', (32, 32), color='red').save(path)
+        self.watcher.poll_once()
+        self.assertEqual(self.watcher.poll_once(), [path])
+        
+        Image.new('RGB', (40, 40), color='blue').save(path)
+        self.watcher.poll_once()
+        self.assertEqual(self.watcher.poll_once(), [path])
+        
+        self.watcher.stop()
+        with Image.open(self.output_dir / "pixel_sprite.png") as result:
+            self.assertEqual(result.size, (40, 40))
+    
+    def test_restart_skips_converted_files(self):
+        """Test that a new watcher does not convert files whose output is up to date."""
+        path = self.input_dir / "sprite.png"
+        Image.new('RGB', (32, 32), color='red').save(path)
+        self.watcher.poll_once()
+        self.watcher.poll_once()
+        self.watcher.stop()
+        
+        restarted = FolderWatcher(self.input_dir, self.output_dir, BatchProcessor(8, 16), settle_time=0)
+        restarted.poll_once()
+        self.assertEqual(restarted.poll_once(), [])
+        
+        Image.new('RGB', (40, 40), color='blue').save(path)
+        restarted.poll_once()
+        self.assertEqual(restarted.poll_once(), [path])
+        restarted.stop()
+    
+    def test_run_survives_errors(self):
+        """Test that scan and callback errors are counted instead of stopping the thread."""
+        def failing_callback(stats):
+            raise RuntimeError("display went away")
+        
+        watcher = FolderWatcher(self.input_dir, self.output_dir, BatchProcessor(8, 16), interval=0.01)
+        watcher.start(on_poll=failing_callback)
+        time.sleep(0.05)
+        self.input_dir.rmdir()
+        time.sleep(0.05)
+        self.assertTrue(watcher._thread.is_alive())
+        watcher.stop()
+        
+        stats = watcher.stats()
+        self.assertGreater(stats["poll_errors"], 1)
+        self.assertNotIn("display", stats["last_poll_error"])
+    
+    def test_ignores_non_images(self):
+        """Test that other files are not queued."""
+        (self.input_dir / "notes.txt").write_text("hello")
+        self.watcher.poll_once()
+        self.assertEqual(self.watcher.poll_once(), [])
+    
+    def test_same_folder_rejected(self):
+        """Test that input and output folders must differ."""
+        with self.assertRaises(ValueError):
+            FolderWatcher(self.input_dir, self.input_dir, BatchProcessor(8, 16))
+
+if __name__ == '__main__':
+    unittest.main()